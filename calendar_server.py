@@ -15,74 +15,21 @@ import sys
 import logging
 import time
 import queue
+import traceback
 
-app = Flask(__name__)
+from log_buffer import LogBuffer
 
-# Log buffer for streaming logs via HTTP
-class LogBuffer:
-    """In-memory ring buffer for storing recent logs"""
-    def __init__(self, max_size=1000):
-        self.max_size = max_size
-        self.logs = []
-        self.lock = threading.Lock()
-        self.subscribers = []  # For SSE streaming
-    
-    def add_log(self, level, message, timestamp=None):
-        """Add a log entry"""
-        if timestamp is None:
-            timestamp = datetime.now().isoformat()
-        
-        log_entry = {
-            'timestamp': timestamp,
-            'level': level,
-            'message': message
-        }
-        
-        with self.lock:
-            self.logs.append(log_entry)
-            if len(self.logs) > self.max_size:
-                self.logs.pop(0)
-            
-            # Notify SSE subscribers
-            for subscriber_queue in self.subscribers[:]:  # Copy list to avoid modification during iteration
-                try:
-                    subscriber_queue.put(log_entry, block=False)
-                except queue.Full:
-                    # Remove subscriber if queue is full (client disconnected)
-                    self.subscribers.remove(subscriber_queue)
-    
-    def get_logs(self, limit=100):
-        """Get recent logs"""
-        with self.lock:
-            return self.logs[-limit:]
-    
-    def subscribe(self):
-        """Subscribe to new logs (returns a queue for SSE streaming)"""
-        subscriber_queue = queue.Queue(maxsize=100)
-        with self.lock:
-            self.subscribers.append(subscriber_queue)
-        return subscriber_queue
-    
-    def unsubscribe(self, subscriber_queue):
-        """Unsubscribe from log updates"""
-        with self.lock:
-            if subscriber_queue in self.subscribers:
-                self.subscribers.remove(subscriber_queue)
+app = Flask(__name__)
 
 # Global log buffer
 log_buffer = LogBuffer(max_size=1000)
 
-# Custom log handler that writes to both stderr and log buffer
+# Custom log handler that feeds the log buffer (stderr is handled by a StreamHandler)
 class LogBufferHandler(logging.Handler):
-    """Log handler that writes to both stderr and log buffer"""
+    """Log handler that adds formatted records to the log buffer"""
     def emit(self, record):
         try:
-            msg = self.format(record)
-            # Write to stderr (original behavior)
-            print(msg, file=sys.stderr)
-            sys.stderr.flush()
-            # Also add to buffer
-            log_buffer.add_log(record.levelname, msg, datetime.fromtimestamp(record.created).isoformat())
+            log_buffer.add_log(record.levelname, self.format(record), datetime.fromtimestamp(record.created).isoformat())
         except Exception:
             self.handleError(record)
 
@@ -103,9 +50,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Configure Flask's logger to also use stderr and buffer
+# Flask's logger propagates to the root handlers above; giving it its own
+# copies as well would write every app.logger record twice
 app.logger.setLevel(logging.INFO)
-app.logger.handlers = [logging.StreamHandler(sys.stderr), buffer_handler]
 
 # Helper function for compatibility with existing print() calls
 def log_info(message):
@@ -201,10 +148,11 @@ def generate_calendar_screenshot(width=1600, height=1200):
             "--disable-extensions"
         ]
         
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        # stdout is never used; stderr is kept only for the failure message
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=30)
         
         if result.returncode != 0:
-            log_info(f"Screenshot failed: {result.stderr}")
+            log_info(f"Screenshot failed: {result.stderr.decode('utf-8', 'replace')}")
             return None
         
         # Verify and fix screenshot dimensions, and crop whitespace if needed
@@ -332,7 +280,6 @@ def generate_calendar_screenshot(width=1600, height=1200):
                 log_info(f"Screenshot dimensions match expected: {width}x{height}")
         except Exception as e:
             log_info(f"Warning: Could not verify/resize screenshot: {e}")
-            import traceback
             log_info(f"Traceback: {traceback.format_exc()}")
         
         # Calculate hash of the image
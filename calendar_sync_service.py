@@ -8,9 +8,14 @@ import argparse
 import tempfile
 
 # Helper function to log to stderr (which is typically visible in service logs)
-def log_info(message):
-    """Log to stderr for visibility in service logs"""
-    print(message, file=sys.stderr)
+def log_info(*messages):
+    """Log one or more lines to stderr for visibility in service logs
+    
+    Every line is prefixed with the current time, taken once per call.
+    Several lines passed together go out in a single write and flush.
+    """
+    prefix = f"[{datetime.now()}] "
+    sys.stderr.write(''.join(prefix + message + '\n' for message in messages))
     sys.stderr.flush()
 
 # Configuration
@@ -40,36 +45,36 @@ def update_status(status_endpoint, fetching=None, uploading=None, error=None):
 
 def download_image(image_url, local_path, status_endpoint=None):
     """Download image from the calendar server"""
-    log_info(f"[{datetime.now()}] Downloading image from {image_url}...")
+    log_info(f"Downloading image from {image_url}...")
     update_status(status_endpoint, fetching=True, uploading=False)
     try:
         response = requests.get(image_url, timeout=90)
         if response.status_code == 200:
             with open(local_path, 'wb') as f:
                 f.write(response.content)
-            log_info(f"[{datetime.now()}] Image downloaded to {local_path}")
+            log_info(f"Image downloaded to {local_path}")
             update_status(status_endpoint, fetching=False, error=None)  # Clear any previous errors
             return True
         else:
             error_msg = f"Failed to download image: HTTP {response.status_code}"
-            log_info(f"[{datetime.now()}] ERROR: {error_msg}")
+            log_info(f"ERROR: {error_msg}")
             update_status(status_endpoint, fetching=False, error=error_msg)
             return False
     except requests.exceptions.ConnectionError as e:
         error_msg = f"Connection error: Calendar server unreachable at {image_url}. Is calendar_server.py running?"
-        log_info(f"[{datetime.now()}] ERROR: {error_msg}")
-        log_info(f"[{datetime.now()}] Full error: {e}")
+        log_info(f"ERROR: {error_msg}",
+                 f"Full error: {e}")
         update_status(status_endpoint, fetching=False, error=error_msg)
         return False
     except Exception as e:
         error_msg = f"Error downloading image: {e}"
-        log_info(f"[{datetime.now()}] ERROR: {error_msg}")
+        log_info(f"ERROR: {error_msg}")
         update_status(status_endpoint, fetching=False, error=error_msg)
         return False
 
 def upload_image_to_endpoint(image_path, endpoint_url, status_endpoint=None, max_retries=3, retry_delay=2):
     """Upload image with retry logic for connection refused errors"""
-    log_info(f"[{datetime.now()}] Uploading {image_path} to endpoint {endpoint_url}...")
+    log_info(f"Uploading {image_path} to endpoint {endpoint_url}...")
     update_status(status_endpoint, fetching=False, uploading=True)
     
     for attempt in range(max_retries):
@@ -86,29 +91,29 @@ def upload_image_to_endpoint(image_path, endpoint_url, status_endpoint=None, max
                 headers = {'X-Calendar-Sync-Upload': 'true'}
                 response = requests.post(endpoint_url, files=files, data=data, headers=headers, timeout=90)
             if response.status_code == 200:
-                log_info(f"[{datetime.now()}] Image uploaded successfully.")
+                log_info("Image uploaded successfully.")
                 update_status(status_endpoint, uploading=False, error=None)  # Clear any previous errors
                 return True
             else:
                 error_msg = f"Failed to upload image: HTTP {response.status_code} - {response.text[:100]}"
-                log_info(f"[{datetime.now()}] ERROR: {error_msg}")
+                log_info(f"ERROR: {error_msg}")
                 update_status(status_endpoint, uploading=False, error=error_msg)
                 return False
         except requests.exceptions.ConnectionError as e:
             if attempt < max_retries - 1:
                 wait_time = retry_delay * (attempt + 1)  # Exponential backoff: 2s, 4s, 6s
-                log_info(f"[{datetime.now()}] Connection refused, retrying in {wait_time}s... (attempt {attempt + 1}/{max_retries})")
+                log_info(f"Connection refused, retrying in {wait_time}s... (attempt {attempt + 1}/{max_retries})")
                 time.sleep(wait_time)
                 continue
             else:
                 error_msg = f"Error uploading image: Connection refused after {max_retries} attempts. Is image_receiver_server.py running?"
-                log_info(f"[{datetime.now()}] ERROR: {error_msg}")
-                log_info(f"[{datetime.now()}] Full error: {e}")
+                log_info(f"ERROR: {error_msg}",
+                         f"Full error: {e}")
                 update_status(status_endpoint, uploading=False, error=error_msg)
                 return False
         except Exception as e:
             error_msg = f"Error uploading image: {e}"
-            log_info(f"[{datetime.now()}] ERROR: {error_msg}")
+            log_info(f"ERROR: {error_msg}")
             update_status(status_endpoint, uploading=False, error=error_msg)
             return False
     
@@ -172,24 +177,24 @@ def main():
     
     # Create temp directory for downloaded images
     temp_dir = tempfile.mkdtemp()
-    log_info(f"[{datetime.now()}] Using temp directory: {temp_dir}")
+    log_info(f"Using temp directory: {temp_dir}")
     
     try:
         # Always do an immediate refresh when starting calendar sync mode
-        log_info(f"[{datetime.now()}] ===== STARTING CALENDAR SYNC MODE =====")
-        log_info(f"[{datetime.now()}] Calendar URL: {calendar_url}")
-        log_info(f"[{datetime.now()}] Image endpoint: {image_endpoint}")
-        log_info(f"[{datetime.now()}] Upload endpoint: {endpoint_url}")
-        log_info(f"[{datetime.now()}] Status endpoint: {status_endpoint}")
-        log_info(f"[{datetime.now()}] Poll interval: {poll_interval} seconds")
-        log_info(f"[{datetime.now()}] Fetching latest calendar image immediately...")
+        log_info("===== STARTING CALENDAR SYNC MODE =====",
+                 f"Calendar URL: {calendar_url}",
+                 f"Image endpoint: {image_endpoint}",
+                 f"Upload endpoint: {endpoint_url}",
+                 f"Status endpoint: {status_endpoint}",
+                 f"Poll interval: {poll_interval} seconds",
+                 "Fetching latest calendar image immediately...")
         refresh_display(image_endpoint, endpoint_url, temp_dir, status_endpoint)
-        log_info(f"[{datetime.now()}] ===== INITIAL IMAGE FETCHED AND DISPLAYED =====")
+        log_info("===== INITIAL IMAGE FETCHED AND DISPLAYED =====")
         
         # Get initial hash after the refresh
         last_hash = get_image_hash(hash_endpoint)
         
-        log_info(f"[{datetime.now()}] Watching for calendar changes with {poll_interval}-second polling...")
+        log_info(f"Watching for calendar changes with {poll_interval}-second polling...")
         
         while True:
             time.sleep(poll_interval)
@@ -200,7 +205,7 @@ def main():
                 if trigger_resp.status_code == 200:
                     trigger_data = trigger_resp.json()
                     if trigger_data.get('trigger', False):
-                        log_info(f"[{datetime.now()}] Manual sync triggered! Refreshing immediately...")
+                        log_info("Manual sync triggered! Refreshing immediately...")
                         refresh_display(image_endpoint, endpoint_url, temp_dir, status_endpoint)
                         last_hash = get_image_hash(hash_endpoint)
                         continue  # Skip the normal change detection for this cycle
@@ -211,18 +216,18 @@ def main():
             # Poll for hash changes
             new_hash = get_image_hash(hash_endpoint)
             if new_hash and new_hash != last_hash:
-                log_info(f"[{datetime.now()}] Change detected! Refreshing...")
+                log_info("Change detected! Refreshing...")
                 refresh_display(image_endpoint, endpoint_url, temp_dir, status_endpoint)
                 last_hash = new_hash
             elif new_hash is None:
                 # Hash fetch failed - log warning but keep polling (recoverable)
-                log_info(f"[{datetime.now()}] WARNING: Failed to fetch hash, will retry in {poll_interval}s")
+                log_info(f"WARNING: Failed to fetch hash, will retry in {poll_interval}s")
     finally:
         # Clean up temp directory
         try:
             os.rmdir(temp_dir)
         except Exception as e:
-            log_info(f"[{datetime.now()}] Warning: Could not remove temp directory: {e}")
+            log_info(f"Warning: Could not remove temp directory: {e}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
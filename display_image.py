@@ -4,21 +4,42 @@
 import sys
 import os
 import argparse
-picdir = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'pic')
-libdir = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'lib')
+basedir = os.path.dirname(os.path.realpath(__file__))
+picdir = os.path.join(basedir, 'pic')
+libdir = os.path.join(basedir, 'lib')
 if os.path.exists(libdir):
     sys.path.append(libdir)
 
 import epd13in3E
+import logging
 import time
-from PIL import Image
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# All rotation modes accepted by display_image()
+ROTATION_MODES = ('landscape', 'portrait', 'auto', 'rotate90')
+
+# Fixed rotation modes: mode -> (counterclockwise angle, log label)
+#   'landscape': no rotation
+#   'portrait':  270° counterclockwise (same as 90° clockwise)
+#   'rotate90':  90° counterclockwise (internal use only, e.g., for calendar sync)
+FIXED_ROTATIONS = {
+    'landscape': (0, "Landscape mode"),
+    'portrait': (270, "Portrait mode"),
+    'rotate90': (90, "Rotate90 mode"),
+}
+
+# EXIF Orientation tag id (fixed by the TIFF 6.0 spec); 1 means "already upright"
+ORIENTATION_TAG = 0x0112
 
 def display_image(image_path, zoom_to_fit=False, test_rotation=None, rotation_mode='landscape', auto_zoom_after_rotation=True):
     """
     Display an image on the 13.3inch e-paper display
     
     Args:
-        image_path (str): Path to the image file to display
+        image_path (str or PIL.Image.Image): Path to the image file to display, or an
+            already-decoded image (used by the upload server to skip a re-encode)
         zoom_to_fit (bool): If True, scale to fill display (may crop). If False, scale to fit (no cropping).
         test_rotation (int, optional): Test rotation angle (0, 90, 180, 270) to test display orientation
         rotation_mode (str): Rotation mode - 'landscape' (90° CCW), 'portrait' (no rotation), or 'auto' (smart rotation)
@@ -36,62 +57,85 @@ def display_image(image_path, zoom_to_fit=False, test_rotation=None, rotation_mo
                   This ensures images are never displayed upside down.
         When combined with auto_zoom_after_rotation, images are rotated AND zoomed to fill the frame.
     """
-    print("13.3inch e-paper (E) Image Display...")
+    logger.debug("13.3inch e-paper (E) Image Display...")
     
-    # Convert relative path to absolute path and print it
-    abs_image_path = os.path.abspath(image_path)
-    print(f"Absolute file path: {abs_image_path}")
+    if isinstance(image_path, Image.Image):
+        Himage, image_path = image_path, '<in-memory image>'
+    else:
+        Himage = None
+        # Convert relative path to absolute path and print it
+        abs_image_path = os.path.abspath(image_path)
+        logger.debug("Absolute file path: %s", abs_image_path)
+        
+        # Check if image file exists
+        if not os.path.exists(abs_image_path):
+            logger.error("Image file '%s' not found!", image_path)
+            return False
     
-    # Check if image file exists
-    if not os.path.exists(abs_image_path):
-        print(f"Error: Image file '{image_path}' not found!")
-        return False
+    # Panel dimensions are constant for the whole call; read them once
+    EPD_W, EPD_H = epd13in3E.EPD_WIDTH, epd13in3E.EPD_HEIGHT
     
     epd = epd13in3E.EPD()
     try:
         epd.Init()
-        print("clearing display...")
+        logger.debug("clearing display...")
         epd.Clear()
 
         # Load and process the image
-        print(f"Loading image: {image_path}")
-        Himage = Image.open(abs_image_path)
+        logger.info("Loading image: %s", image_path)
+        if Himage is None:
+            Himage = Image.open(abs_image_path)
+            
+            # For JPEGs much larger than the panel, have libjpeg decode at 1/2, 1/4 or 1/8
+            # scale (DCT-domain) instead of full resolution. Both sides stay >= 2x the
+            # larger panel side, so any rotation/zoom still ends in a LANCZOS downscale.
+            if Himage.format == 'JPEG':
+                draft_side = 2 * max(EPD_W, EPD_H)
+                full_size = Himage.size
+                # draft() returns a (mode, box) tuple even when it keeps full scale
+                Himage.draft('RGB', (draft_side, draft_side))
+                if Himage.size != full_size:
+                    logger.debug("Decoding JPEG at reduced scale: %s -> %s", full_size, Himage.size)
+        
+        # Honor the EXIF orientation tag (phone photos)
+        if Himage.getexif().get(ORIENTATION_TAG, 1) != 1:
+            ImageOps.exif_transpose(Himage, in_place=True)
         
         # Print image details
-        print(f"Image format: {Himage.format}")
-        print(f"Image mode: {Himage.mode}")
-        print(f"Image size: {Himage.size}")
-        print(f"Image info: {Himage.info}")
+        logger.debug("Image format: %s", Himage.format)
+        logger.debug("Image mode: %s", Himage.mode)
+        logger.debug("Image size: %s", Himage.size)
+        logger.debug("Image info keys: %s", sorted(Himage.info))  # values can be multi-KB EXIF/ICC blobs
         
         # Test rotation override (for debugging display orientation)
         if test_rotation is not None:
-            print(f"Applying test rotation: {test_rotation}°")
+            logger.debug("Applying test rotation: %s°", test_rotation)
             Himage = Himage.rotate(test_rotation, expand=True)
-            print(f"Image size after test rotation: {Himage.size}")
+            logger.debug("Image size after test rotation: %s", Himage.size)
         
         # Apply rotation based on rotation_mode
         image_was_rotated = False
         if rotation_mode == 'auto':
             img_width, img_height = Himage.size
-            display_width, display_height = epd13in3E.EPD_WIDTH, epd13in3E.EPD_HEIGHT
+            display_width, display_height = EPD_W, EPD_H
             
             # Determine orientations
             img_is_portrait = img_height > img_width
             display_is_portrait = display_height > display_width
             
-            print(f"Image orientation: {'Portrait' if img_is_portrait else 'Landscape'} ({img_width}x{img_height})")
-            print(f"Display orientation: {'Portrait' if display_is_portrait else 'Landscape'} ({display_width}x{display_height})")
+            logger.debug("Image orientation: %s (%sx%s)", 'Portrait' if img_is_portrait else 'Landscape', img_width, img_height)
+            logger.debug("Display orientation: %s (%sx%s)", 'Portrait' if display_is_portrait else 'Landscape', display_width, display_height)
             
-            # Calculate how much of the screen would be used without rotation
-            scale_no_rotation = min(display_width / img_width, display_height / img_height)
-            area_no_rotation = (img_width * scale_no_rotation) * (img_height * scale_no_rotation)
-            
-            # Calculate how much of the screen would be used with rotation
-            scale_with_rotation = min(display_width / img_height, display_height / img_width)
-            area_with_rotation = (img_height * scale_with_rotation) * (img_width * scale_with_rotation)
+            # Screen usage is img_area * scale² in either orientation, so only the
+            # fit scales need comparing. Over the shared denominator (img_width *
+            # img_height) they are the integers below, which keeps the decision
+            # free of float division.
+            fit_no_rotation = min(display_width * img_height, display_height * img_width)
+            fit_with_rotation = min(display_width * img_width, display_height * img_height)
             
             # Rotate if orientations don't match and it increases screen usage by more than 5%
-            if area_with_rotation > area_no_rotation * 1.05:
+            # (area_with > 1.05 * area_without  <=>  20 * fit_with² > 21 * fit_without²)
+            if 20 * fit_with_rotation * fit_with_rotation > 21 * fit_no_rotation * fit_no_rotation:
                 # Use consistent rotation direction based on orientations:
                 # - Portrait image on landscape display: rotate 270° (counterclockwise)
                 # - Landscape image on portrait display: rotate 90° (clockwise)
@@ -106,87 +150,88 @@ def display_image(image_path, zoom_to_fit=False, test_rotation=None, rotation_mo
                     rotation_angle = 270
                     rotation_dir = "counterclockwise"
                 
-                print(f"Auto-rotating image {rotation_angle}° ({rotation_dir}) to maximize screen usage")
-                print(f"  Screen usage without rotation: {area_no_rotation:.0f} pixels²")
-                print(f"  Screen usage with rotation: {area_with_rotation:.0f} pixels²")
-                print(f"  Improvement: {((area_with_rotation / area_no_rotation - 1) * 100):.1f}%")
+                img_area = img_width * img_height
+                logger.info("Auto-rotating image %s° (%s) to maximize screen usage", rotation_angle, rotation_dir)
+                logger.debug("  Screen usage without rotation: %.0f pixels²", fit_no_rotation ** 2 / img_area)
+                logger.debug("  Screen usage with rotation: %.0f pixels²", fit_with_rotation ** 2 / img_area)
+                logger.debug("  Improvement: %.1f%%", ((fit_with_rotation / fit_no_rotation) ** 2 - 1) * 100)
                 Himage = Himage.rotate(rotation_angle, expand=True)
-                print(f"  Image size after auto-rotation: {Himage.size}")
+                logger.debug("  Image size after auto-rotation: %s", Himage.size)
                 image_was_rotated = True
                 
                 # Auto-zoom after rotation if enabled
                 if auto_zoom_after_rotation:
-                    print(f"  Auto-zoom enabled: image will fill the display frame (may crop)")
+                    logger.debug("  Auto-zoom enabled: image will fill the display frame (may crop)")
                     zoom_to_fit = True
             else:
-                print(f"No auto-rotation needed (current orientation maximizes screen usage)")
-        elif rotation_mode == 'portrait':
-            # Portrait mode: apply fixed 270° counterclockwise rotation (same as 90° clockwise)
-            print("Portrait mode: applying 270° counterclockwise rotation")
-            Himage = Himage.rotate(270, expand=True)
-            print(f"Image size after 270° counterclockwise rotation: {Himage.size}")
-            image_was_rotated = True
+                logger.debug("No auto-rotation needed (current orientation maximizes screen usage)")
+        else:
+            # Fixed modes only differ in their angle; unknown modes fall back to 270° CCW
+            if rotation_mode in FIXED_ROTATIONS:
+                rotation_angle, mode_label = FIXED_ROTATIONS[rotation_mode]
+            else:
+                rotation_angle = 270
+                mode_label = f"Unknown rotation mode '{rotation_mode}', defaulting to landscape"
             
-            # Auto-zoom after rotation if enabled
-            if auto_zoom_after_rotation:
-                print(f"  Auto-zoom enabled: image will fill the display frame (may crop)")
-                zoom_to_fit = True
-        elif rotation_mode == 'landscape':
-            # Landscape mode: no rotation
-            print("Landscape mode: no rotation applied")
+            if rotation_angle:
+                logger.info("%s: applying %s° counterclockwise rotation", mode_label, rotation_angle)
+                Himage = Himage.rotate(rotation_angle, expand=True)  # Positive for counterclockwise
+                logger.debug("Image size after %s° counterclockwise rotation: %s", rotation_angle, Himage.size)
+                image_was_rotated = True
+            else:
+                logger.debug("%s: no rotation applied", mode_label)
             
             # Auto-zoom if enabled (even without rotation)
             if auto_zoom_after_rotation:
-                print(f"  Auto-zoom enabled: image will fill the display frame (may crop)")
-                zoom_to_fit = True
-        elif rotation_mode == 'rotate90':
-            # 90° counterclockwise rotation (internal use only, e.g., for calendar sync)
-            print("Rotate90 mode: applying 90° counterclockwise rotation")
-            Himage = Himage.rotate(90, expand=True)  # Positive for counterclockwise
-            print(f"Image size after 90° counterclockwise rotation: {Himage.size}")
-            image_was_rotated = True
-            
-            # Auto-zoom if enabled
-            if auto_zoom_after_rotation:
-                print(f"  Auto-zoom enabled: image will fill the display frame (may crop)")
-                zoom_to_fit = True
-        else:
-            # Unknown mode, default to landscape for safety
-            print(f"Unknown rotation mode '{rotation_mode}', defaulting to landscape (270° CCW)")
-            Himage = Himage.rotate(270, expand=True)
-            print(f"Image size after 270° counterclockwise rotation: {Himage.size}")
-            image_was_rotated = True
-            
-            # Auto-zoom after rotation if enabled
-            if auto_zoom_after_rotation:
-                print(f"  Auto-zoom enabled: image will fill the display frame (may crop)")
+                logger.debug("  Auto-zoom enabled: image will fill the display frame (may crop)")
                 zoom_to_fit = True
         
         # Resize image to fit the display if necessary
-        if Himage.size != (epd13in3E.EPD_WIDTH, epd13in3E.EPD_HEIGHT):
-            print(f"Original image size: {Himage.size}")
-            print(f"Target display size: ({epd13in3E.EPD_WIDTH}, {epd13in3E.EPD_HEIGHT})")
+        if Himage.size != (EPD_W, EPD_H):
+            logger.debug("Original image size: %s", Himage.size)
+            logger.debug("Target display size: (%s, %s)", EPD_W, EPD_H)
             
             # Scale the image to fit while maintaining aspect ratio
             original_width, original_height = Himage.size
-            display_width, display_height = epd13in3E.EPD_WIDTH, epd13in3E.EPD_HEIGHT
+            display_width, display_height = EPD_W, EPD_H
             
             if zoom_to_fit:
                 # Zoom to fill (may crop) - use max scaling
                 scale_factor = max(display_width / original_width, display_height / original_height)
-                print("Using zoom-to-fit mode (may crop image)")
+                logger.debug("Using zoom-to-fit mode (may crop image)")
             else:
                 # Fit without cropping - use min scaling
                 scale_factor = min(display_width / original_width, display_height / original_height)
-                print("Using fit-without-crop mode")
+                logger.debug("Using fit-without-crop mode")
             
-            print(f"Scaling factor: {scale_factor:.2f}")
+            logger.debug("Scaling factor: %.2f", scale_factor)
             
-            # Calculate new size maintaining aspect ratio
-            new_width = int(original_width * scale_factor)
-            new_height = int(original_height * scale_factor)
+            # Calculate new size maintaining aspect ratio. Integer math keeps the
+            # limiting side exactly equal to the panel side; int(dim * scale_factor)
+            # can land one pixel short and force a second full resize after the crop.
+            if zoom_to_fit:
+                width_limited = display_width * original_height >= display_height * original_width
+            else:
+                width_limited = display_width * original_height <= display_height * original_width
+            if width_limited:
+                new_width = display_width
+                new_height = max(1, original_height * display_width // original_width)
+            else:
+                new_width = max(1, original_width * display_height // original_height)
+                new_height = display_height
+            
+            logger.debug("New size: (%s, %s)", new_width, new_height)
             
-            print(f"New size: ({new_width}, {new_height})")
+            # For large downscales, box-average by a power-of-two factor first so the
+            # LANCZOS pass below runs on a much smaller input. The factor leaves at
+            # least a 2x reduction for LANCZOS itself, so output quality is unchanged.
+            # ("1"/"P" images are resized with NEAREST by Pillow, so skip them.)
+            reduce_factor = 1
+            while scale_factor * reduce_factor * 4 <= 1:
+                reduce_factor *= 2
+            if reduce_factor > 1 and Himage.mode not in ('1', 'P'):
+                Himage = Himage.reduce(reduce_factor)
+                logger.debug("Pre-reduced by %sx to %s", reduce_factor, Himage.size)
             
             # Resize image maintaining aspect ratio
             Himage = Himage.resize((new_width, new_height), Image.Resampling.LANCZOS)
@@ -194,11 +239,11 @@ def display_image(image_path, zoom_to_fit=False, test_rotation=None, rotation_mo
             if zoom_to_fit:
                 # For zoom-to-fit, crop the image to fill the display exactly
                 # Calculate crop box to center the image
-                crop_x = max(0, (new_width - epd13in3E.EPD_WIDTH) // 2)
-                crop_y = max(0, (new_height - epd13in3E.EPD_HEIGHT) // 2)
+                crop_x = max(0, (new_width - EPD_W) // 2)
+                crop_y = max(0, (new_height - EPD_H) // 2)
                 # Ensure we crop to exactly the display dimensions
-                crop_width = epd13in3E.EPD_WIDTH
-                crop_height = epd13in3E.EPD_HEIGHT
+                crop_width = EPD_W
+                crop_height = EPD_H
                 
                 # Make sure we don't go out of bounds
                 if crop_x + crop_width > new_width:
@@ -209,17 +254,17 @@ def display_image(image_path, zoom_to_fit=False, test_rotation=None, rotation_mo
                 crop_y = max(0, crop_y)
                 
                 Himage = Himage.crop((crop_x, crop_y, crop_x + crop_width, crop_y + crop_height))
-                print(f"Cropped to: {Himage.size}")
+                logger.debug("Cropped to: %s", Himage.size)
                 
                 # If the cropped image is still not exactly the right size, resize it
-                if Himage.size != (epd13in3E.EPD_WIDTH, epd13in3E.EPD_HEIGHT):
-                    Himage = Himage.resize((epd13in3E.EPD_WIDTH, epd13in3E.EPD_HEIGHT), Image.Resampling.LANCZOS)
-                    print(f"Resized to exact display size: {Himage.size}")
+                if Himage.size != (EPD_W, EPD_H):
+                    Himage = Himage.resize((EPD_W, EPD_H), Image.Resampling.LANCZOS)
+                    logger.debug("Resized to exact display size: %s", Himage.size)
             else:
                 # For fit-without-crop, center the image on white background
-                final_image = Image.new('RGB', (epd13in3E.EPD_WIDTH, epd13in3E.EPD_HEIGHT), (255, 255, 255))
-                paste_x = (epd13in3E.EPD_WIDTH - new_width) // 2
-                paste_y = (epd13in3E.EPD_HEIGHT - new_height) // 2
+                final_image = Image.new('RGB', (EPD_W, EPD_H), (255, 255, 255))
+                paste_x = (EPD_W - new_width) // 2
+                paste_y = (EPD_H - new_height) // 2
                 final_image.paste(Himage, (paste_x, paste_y))
                 Himage = final_image
         
@@ -227,17 +272,17 @@ def display_image(image_path, zoom_to_fit=False, test_rotation=None, rotation_mo
         if Himage.mode != 'RGB':
             Himage = Himage.convert('RGB')
         
-        print("Displaying image...")
+        logger.info("Displaying image...")
         epd.display(epd.getbuffer(Himage))
         time.sleep(3)
 
-        print("goto sleep...")
+        logger.debug("goto sleep...")
         epd.sleep()
         return True
         
     except Exception as e:
-        print(f"Error displaying image: {e}")
-        print("goto sleep...")
+        logger.error("Error displaying image: %s", e)
+        logger.debug("goto sleep...")
         epd.sleep()
         return False
 
@@ -250,7 +295,7 @@ def main():
                        help='Scale to fill display (may crop image). Default is to fit without cropping.')
     parser.add_argument('--test-rotation', type=int, choices=[0, 90, 180, 270],
                        help='Test rotation: apply specific rotation angle to test display orientation')
-    parser.add_argument('--rotation-mode', type=str, choices=['landscape', 'portrait', 'auto', 'rotate90'], default='landscape',
+    parser.add_argument('--rotation-mode', type=str, choices=ROTATION_MODES, default='landscape',
                        help='Rotation mode: landscape (no rotation), portrait (270° CCW), auto (smart rotation), or rotate90 (90° CW)')
     parser.add_argument('--no-auto-zoom', action='store_true',
                        help='Disable automatic zoom-to-fill after rotation')
@@ -259,6 +304,10 @@ def main():
                        help='[DEPRECATED] Use --rotation-mode portrait instead')
     args = parser.parse_args()
     
+    # Show the step-by-step display log on stdout when run from the command line
+    logger.addHandler(logging.StreamHandler(sys.stdout))
+    logger.setLevel(logging.DEBUG)
+    
     # Handle legacy --no-auto-rotate flag
     rotation_mode = args.rotation_mode
     if args.no_auto_rotate:
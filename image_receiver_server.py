@@ -1,74 +1,65 @@
 #!/usr/bin/env python3
-from flask import Flask, request, jsonify, render_template, Response, stream_with_context
+from flask import Flask, Request, request, jsonify, render_template, Response, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.serving import make_server
 import os
 import tempfile
 import subprocess
 import sys
 import gc
+import copy
+import hashlib
 import json
+import logging
+import math
 import threading
-import time
 import signal
+import select
 import atexit
 import queue
 from datetime import datetime
 from PIL import Image
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# The display driver loads the panel's native library (lib/*.so) at import time.
+# Without it the server still serves settings, mode and logs; only uploads fail.
+try:
+    import display_image
+    _display_import_error = None
+except (ImportError, OSError) as e:
+    display_image = None
+    _display_import_error = str(e)
+from log_buffer import LogBuffer
+
+# Load Pillow's common format plugins (JPEG, PNG, BMP, GIF, PPM) at startup;
+# otherwise the first Image.open() of the process imports them mid-request
+Image.preinit()
+
 app = Flask(__name__)
 
-# Force Flask to reload templates on every request (disable template caching)
-app.config['TEMPLATES_AUTO_RELOAD'] = True
-
-# Log buffer for streaming logs via HTTP
-class LogBuffer:
-    """In-memory ring buffer for storing recent logs"""
-    def __init__(self, max_size=1000):
-        self.max_size = max_size
-        self.logs = []
-        self.lock = threading.Lock()
-        self.subscribers = []  # For SSE streaming
-    
-    def add_log(self, level, message, timestamp=None):
-        """Add a log entry"""
-        if timestamp is None:
-            timestamp = datetime.now().isoformat()
-        
-        log_entry = {
-            'timestamp': timestamp,
-            'level': level,
-            'message': message
-        }
+if orjson is not None:
+    class OrjsonProvider(DefaultJSONProvider):
+        """jsonify()/get_json() backed by orjson, keeping Flask's sorted-key output"""
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, default=self.default, option=orjson.OPT_SORT_KEYS).decode()
         
-        with self.lock:
-            self.logs.append(log_entry)
-            if len(self.logs) > self.max_size:
-                self.logs.pop(0)
-            
-            # Notify SSE subscribers
-            for subscriber_queue in self.subscribers[:]:  # Copy list to avoid modification during iteration
-                try:
-                    subscriber_queue.put(log_entry, block=False)
-                except queue.Full:
-                    # Remove subscriber if queue is full (client disconnected)
-                    self.subscribers.remove(subscriber_queue)
-    
-    def get_logs(self, limit=100):
-        """Get recent logs"""
-        with self.lock:
-            return self.logs[-limit:]
-    
-    def subscribe(self):
-        """Subscribe to new logs (returns a queue for SSE streaming)"""
-        subscriber_queue = queue.Queue(maxsize=100)
-        with self.lock:
-            self.subscribers.append(subscriber_queue)
-        return subscriber_queue
-    
-    def unsubscribe(self, subscriber_queue):
-        """Unsubscribe from log updates"""
-        with self.lock:
-            if subscriber_queue in self.subscribers:
-                self.subscribers.remove(subscriber_queue)
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+    
+    app.json = OrjsonProvider(app)
+
+# The upload page's CSS/JS are separate static files; let browsers reuse them
+# for an hour before revalidating
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 3600
 
 # Global log buffer
 log_buffer = LogBuffer(max_size=1000)
@@ -84,47 +75,137 @@ _calendar_sync_status = {
     'fetching': False,
     'uploading': False
 }
-_manual_sync_trigger = False  # Flag to trigger manual sync
+_manual_sync_trigger = threading.Event()  # Set to trigger a manual sync
 
-# Helper function to log to stderr (which Flask shows) for important messages
-def log_info(message):
-    """Log to stderr (which Flask shows in logs) and log buffer"""
-    print(message, file=sys.stderr)
-    sys.stderr.flush()
-    # Also add to log buffer
-    log_buffer.add_log('INFO', message, datetime.now().isoformat())
+# Serializes access to the e-paper panel across request threads
+_display_lock = threading.Lock()
 
-IMAGE_SCRIPT = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'display_image.py')
-CONFIG_FILE = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'config.json')
-SERVICE_MANAGER = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'service_manager.py')
-CALENDAR_SYNC_SCRIPT = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'calendar_sync_service.py')
+# Custom log handler that feeds the log buffer (stderr is handled by a StreamHandler)
+class LogBufferHandler(logging.Handler):
+    """Log handler that adds formatted records to the log buffer"""
+    def emit(self, record):
+        try:
+            log_buffer.add_log(record.levelname, self.format(record), datetime.fromtimestamp(record.created).isoformat())
+        except Exception:
+            self.handleError(record)
+
+# Configure logging to go to stderr (which systemd/journald captures) and log buffer.
+# Per-upload detail is logged at DEBUG, so at the default INFO level those calls
+# return before any message formatting happens.
+log_format = logging.Formatter('[%(asctime)s] %(levelname)s: %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+stderr_handler = logging.StreamHandler(sys.stderr)
+stderr_handler.setFormatter(log_format)
+buffer_handler = LogBufferHandler()
+buffer_handler.setFormatter(logging.Formatter('%(message)s'))  # Viewer shows timestamp/level itself
+
+logger = logging.getLogger(__name__)
+# display_image() runs in-process, so its records go to the same place
+for _logger in (logger, logging.getLogger('display_image')):
+    _logger.setLevel(logging.INFO)
+    _logger.handlers = [stderr_handler, buffer_handler]
+    _logger.propagate = False
+if display_image is None:
+    logger.warning("Display driver unavailable, uploads will fail: %s", _display_import_error)
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+CONFIG_FILE = os.path.join(SCRIPT_DIR, 'config.json')
+CALENDAR_SYNC_SCRIPT = os.path.join(SCRIPT_DIR, 'calendar_sync_service.py')
 
 # Memory optimization settings
 MAX_IMAGE_DIMENSION = 2000  # Maximum dimension for large images
-COMPRESSION_QUALITY = 6      # PNG compression level (0-9, lower = smaller file)
+COMPRESSION_QUALITY = 6      # Deprecated, no effect: uploads are no longer re-encoded; /config still accepts and echoes it
+MAX_UPLOAD_PIXELS = 50_000_000  # Larger non-JPEG uploads are rejected before decoding
+MAX_UPLOAD_BYTES = 64 * 1024 * 1024  # Larger request bodies get a 413 before anything is written
 ENABLE_MEMORY_OPTIMIZATION = True
 
-def load_config():
-    """Load configuration from JSON file"""
-    if os.path.exists(CONFIG_FILE):
-        with open(CONFIG_FILE, 'r') as f:
-            return json.load(f)
-    # Return default config if file doesn't exist
-    return {
-        'mode': 'image_receiver',
-        'calendar_sync': {
-            'calendar_url': 'http://localhost:5000'
-        },
-        'image_receiver': {
-            'host': '0.0.0.0',
-            'port': 8000
-        }
+# Spool uploads to tmpfs when available so the SD card never sees the temp file;
+# containers can mount /dev/shm read-only, so it must also be writable
+UPLOAD_TMP_DIR = '/dev/shm' if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK) else None
+
+class UploadRequest(Request):
+    """Request that spools multipart file uploads straight into UPLOAD_TMP_DIR
+    
+    Werkzeug's default keeps uploads under 500 KB in memory and writes larger ones
+    to the default tempdir, which /upload then had to copy again. A named file in
+    UPLOAD_TMP_DIR can be handed to display_image() as-is; it is removed when the
+    request's files are closed.
+    """
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.NamedTemporaryFile(dir=UPLOAD_TMP_DIR, suffix='.upload')
+
+app.request_class = UploadRequest
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_BYTES
+
+_config_cache = None  # ((st_mtime_ns, st_size), parsed config) of the last config.json read
+
+DEFAULT_CONFIG = {
+    'mode': 'image_receiver',
+    'calendar_sync': {
+        'calendar_url': 'http://localhost:5000'
+    },
+    'image_receiver': {
+        'host': '0.0.0.0',
+        'port': 8000
     }
+}
+
+def _read_config():
+    """Return the parsed config.json, shared and read-only (use load_config() to modify)
+    
+    The parsed file is cached and only re-read when its mtime or size changes
+    (service_manager.py also writes it).
+    """
+    global _config_cache
+    try:
+        st = os.stat(CONFIG_FILE)
+    except FileNotFoundError:
+        # Return default config if file doesn't exist
+        return DEFAULT_CONFIG
+    key = (st.st_mtime_ns, st.st_size)
+    cache = _config_cache
+    if cache is None or cache[0] != key:
+        with open(CONFIG_FILE, 'rb') as f:
+            data = f.read()
+        cache = _config_cache = (key, orjson.loads(data) if orjson else json.loads(data))
+    return cache[1]
+
+def load_config():
+    """Load configuration from JSON file
+    
+    Callers get their own copy to modify.
+    """
+    return copy.deepcopy(_read_config())
+
+def get_mode():
+    """Current operating mode; one stat() and no copy of the config"""
+    return _read_config().get('mode', 'image_receiver')
 
 def save_config(config):
     """Save configuration to JSON file"""
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=2)
+    global _config_cache
+    if orjson is not None:
+        data = orjson.dumps(config, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(config, indent=2).encode()
+    # Write a sibling temp file and rename it over config.json: a crash or power
+    # loss mid-write, or service_manager.py reading concurrently, never sees a
+    # truncated file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(CONFIG_FILE), prefix='.config.', suffix='.json.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file 0600; keep config.json's existing permissions
+        try:
+            os.chmod(tmp_path, os.stat(CONFIG_FILE).st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, CONFIG_FILE)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    _config_cache = None
 
 def start_calendar_sync_process():
     """Start calendar sync service as a background process"""
@@ -132,41 +213,49 @@ def start_calendar_sync_process():
     
     with _calendar_sync_lock:
         if _calendar_sync_process and _calendar_sync_process.poll() is None:
-            log_info(f"[{datetime.now()}] Calendar sync process already running (PID: {_calendar_sync_process.pid})")
+            logger.info("Calendar sync process already running (PID: %s)", _calendar_sync_process.pid)
+            return True
+    
+    config = load_config()
+    sync_config = config.get('calendar_sync', {})
+    receiver_config = config.get('image_receiver', {})
+    
+    # Determine endpoint URL from image_receiver config
+    receiver_host = receiver_config.get('host', '0.0.0.0')
+    receiver_port = receiver_config.get('port', 8000)
+    
+    if receiver_host == '0.0.0.0':
+        endpoint_host = 'localhost'
+    else:
+        endpoint_host = receiver_host
+    
+    endpoint_url = f"http://{endpoint_host}:{receiver_port}/upload"
+    calendar_url = sync_config.get('calendar_url', 'http://localhost:5000')
+    
+    # Build command - always polls every 5 seconds
+    cmd = [sys.executable, CALENDAR_SYNC_SCRIPT]
+    cmd.extend(['--calendar-url', calendar_url])
+    cmd.extend(['--endpoint-url', endpoint_url])
+    
+    logger.info("Starting calendar sync process...")
+    logger.info("Command: %s", ' '.join(cmd))
+    
+    # Verify the upload endpoint is accessible before starting the sync service.
+    # Done without holding the lock: it can take up to the 2 s timeout, and every
+    # /calendar_sync/status update needs the lock meanwhile.
+    try:
+        import requests
+        test_response = requests.get(endpoint_url.replace('/upload', '/'), timeout=2)
+        logger.info("Verified upload endpoint is accessible")
+    except Exception as e:
+        logger.warning("Could not verify upload endpoint: %s", e)
+        logger.info("Continuing anyway - sync service will retry connection...")
+    
+    with _calendar_sync_lock:
+        # Another thread may have started it while the lock was released
+        if _calendar_sync_process and _calendar_sync_process.poll() is None:
+            logger.info("Calendar sync process already running (PID: %s)", _calendar_sync_process.pid)
             return True
-        
-        config = load_config()
-        sync_config = config.get('calendar_sync', {})
-        receiver_config = config.get('image_receiver', {})
-        
-        # Determine endpoint URL from image_receiver config
-        receiver_host = receiver_config.get('host', '0.0.0.0')
-        receiver_port = receiver_config.get('port', 8000)
-        
-        if receiver_host == '0.0.0.0':
-            endpoint_host = 'localhost'
-        else:
-            endpoint_host = receiver_host
-        
-        endpoint_url = f"http://{endpoint_host}:{receiver_port}/upload"
-        calendar_url = sync_config.get('calendar_url', 'http://localhost:5000')
-        
-        # Build command - always polls every 5 seconds
-        cmd = [sys.executable, CALENDAR_SYNC_SCRIPT]
-        cmd.extend(['--calendar-url', calendar_url])
-        cmd.extend(['--endpoint-url', endpoint_url])
-        
-        log_info(f"[{datetime.now()}] Starting calendar sync process...")
-        log_info(f"[{datetime.now()}] Command: {' '.join(cmd)}")
-        
-        # Verify the upload endpoint is accessible before starting the sync service
-        try:
-            import requests
-            test_response = requests.get(endpoint_url.replace('/upload', '/'), timeout=2)
-            log_info(f"[{datetime.now()}] Verified upload endpoint is accessible")
-        except Exception as e:
-            log_info(f"[{datetime.now()}] WARNING: Could not verify upload endpoint: {e}")
-            log_info(f"[{datetime.now()}] Continuing anyway - sync service will retry connection...")
         
         try:
             _calendar_sync_process = subprocess.Popen(
@@ -175,63 +264,133 @@ def start_calendar_sync_process():
                 stderr=None,
                 start_new_session=True
             )
-            log_info(f"[{datetime.now()}] Calendar sync process started (PID: {_calendar_sync_process.pid})")
+            logger.info("Calendar sync process started (PID: %s)", _calendar_sync_process.pid)
             _calendar_sync_status['active'] = True
             _calendar_sync_status['process_pid'] = _calendar_sync_process.pid
+            threading.Thread(target=_watch_calendar_sync_process, args=(_calendar_sync_process,),
+                             name='calendar-sync-watch', daemon=True).start()
             return True
         except Exception as e:
-            log_info(f"[{datetime.now()}] Failed to start calendar sync process: {e}")
+            logger.error("Failed to start calendar sync process: %s", e)
             _calendar_sync_status['active'] = False
             _calendar_sync_status['last_error'] = str(e)
             return False
 
+def _wait_for_exit(proc, timeout=None):
+    """Wait for proc to exit, sleeping on a pidfd instead of polling waitpid()
+    
+    Popen.wait(timeout=...) loops over waitpid(WNOHANG) with growing sleeps;
+    a pidfd becomes readable the moment the child exits. Falls back to
+    Popen.wait() where pidfd_open() is unavailable (non-Linux, kernel < 5.3).
+    Raises subprocess.TimeoutExpired like Popen.wait().
+    """
+    try:
+        pidfd = os.pidfd_open(proc.pid)
+    except (AttributeError, OSError):
+        return proc.wait(timeout=timeout)
+    try:
+        # Reaped by another waiter before the pidfd was opened: the pid may
+        # already belong to a different process
+        if proc.returncode is not None:
+            return proc.returncode
+        poller = select.poll()
+        poller.register(pidfd, select.POLLIN)
+        if not poller.poll(None if timeout is None else int(timeout * 1000)):
+            raise subprocess.TimeoutExpired(proc.args, timeout)
+    finally:
+        os.close(pidfd)
+    # The child has exited; this only reaps it
+    return proc.wait()
+
+def _watch_calendar_sync_process(proc):
+    """Clear the calendar sync state as soon as proc exits (daemon thread)
+    
+    Lets /calendar_sync/status report a crashed sync process right away, and
+    without a waitpid() per poll.
+    """
+    global _calendar_sync_process
+    _wait_for_exit(proc)
+    with _calendar_sync_lock:
+        # Not a stop_calendar_sync_process() in progress or already done
+        if _calendar_sync_process is proc:
+            logger.warning("Calendar sync process exited unexpectedly (PID: %s, exit code: %s)",
+                           proc.pid, proc.returncode)
+            _calendar_sync_process = None
+            _calendar_sync_status['active'] = False
+            _calendar_sync_status['process_pid'] = None
+
+SHUTDOWN_GRACE_DEFAULT = 5
+SHUTDOWN_GRACE_MAX = 600  # Keeps the poll() timeout well inside a C int
+
+def _shutdown_grace_seconds():
+    """calendar_sync.shutdown_grace_seconds from config.json, validated
+    
+    Never raises: stopping the child (also from the SIGTERM handler) must not
+    depend on config.json being readable or sane. Non-numeric or non-finite
+    values fall back to the default; the rest is clamped to [0, SHUTDOWN_GRACE_MAX].
+    """
+    try:
+        value = _read_config().get('calendar_sync', {}).get('shutdown_grace_seconds', SHUTDOWN_GRACE_DEFAULT)
+        grace = float(value)
+        if not math.isfinite(grace):
+            raise ValueError(f"not a finite number: {value!r}")
+    except Exception as e:
+        logger.warning("Invalid calendar_sync.shutdown_grace_seconds (%s), using %ss", e, SHUTDOWN_GRACE_DEFAULT)
+        return SHUTDOWN_GRACE_DEFAULT
+    return min(max(grace, 0.0), SHUTDOWN_GRACE_MAX)
+
 def stop_calendar_sync_process():
-    """Stop calendar sync service process"""
+    """Stop calendar sync service process
+    
+    Sends SIGTERM, then SIGKILL if it hasn't exited within the
+    calendar_sync.shutdown_grace_seconds config value (default 5).
+    """
     global _calendar_sync_process, _calendar_sync_status
     
+    grace = _shutdown_grace_seconds()
+    
     with _calendar_sync_lock:
         if not _calendar_sync_process:
-            log_info(f"[{datetime.now()}] No calendar sync process to stop")
+            logger.info("No calendar sync process to stop")
             _calendar_sync_status['active'] = False
             return True
         
         if _calendar_sync_process.poll() is not None:
-            log_info(f"[{datetime.now()}] Calendar sync process already stopped")
+            logger.info("Calendar sync process already stopped")
             _calendar_sync_process = None
             _calendar_sync_status['active'] = False
             return True
         
-        log_info(f"[{datetime.now()}] Stopping calendar sync process (PID: {_calendar_sync_process.pid})...")
+        logger.info("Stopping calendar sync process (PID: %s)...", _calendar_sync_process.pid)
         
         try:
             # Kill the entire process group to ensure child processes are also terminated
-            import os
             try:
                 os.killpg(os.getpgid(_calendar_sync_process.pid), signal.SIGTERM)
-                log_info(f"[{datetime.now()}] Sent SIGTERM to process group {os.getpgid(_calendar_sync_process.pid)}")
+                logger.info("Sent SIGTERM to process group %s", os.getpgid(_calendar_sync_process.pid))
             except (ProcessLookupError, PermissionError):
                 # Process group doesn't exist or permission denied, try direct termination
                 _calendar_sync_process.terminate()
             
-            # Wait up to 5 seconds for termination
+            # Wait up to the grace period for termination
             try:
-                _calendar_sync_process.wait(timeout=5)
+                _wait_for_exit(_calendar_sync_process, timeout=grace)
             except subprocess.TimeoutExpired:
-                log_info(f"[{datetime.now()}] Process didn't terminate, forcing kill...")
+                logger.info("Process didn't terminate, forcing kill...")
                 try:
                     os.killpg(os.getpgid(_calendar_sync_process.pid), signal.SIGKILL)
                 except (ProcessLookupError, PermissionError):
                     _calendar_sync_process.kill()
-                _calendar_sync_process.wait()
+                _wait_for_exit(_calendar_sync_process)
             
-            log_info(f"[{datetime.now()}] Calendar sync process stopped")
+            logger.info("Calendar sync process stopped")
             _calendar_sync_process = None
             _calendar_sync_status['active'] = False
             _calendar_sync_status['fetching'] = False
             _calendar_sync_status['uploading'] = False
             return True
         except Exception as e:
-            log_info(f"[{datetime.now()}] Error stopping calendar sync process: {e}")
+            logger.error("Error stopping calendar sync process: %s", e)
             _calendar_sync_process = None
             _calendar_sync_status['active'] = False
             return False
@@ -239,38 +398,44 @@ def stop_calendar_sync_process():
 def update_calendar_sync_status(fetching=False, uploading=False, error=None):
     """Update calendar sync status"""
     global _calendar_sync_status
+    # One timestamp for every field this update touches, taken outside the lock
+    now = datetime.now().isoformat()
     with _calendar_sync_lock:
         if fetching is not None:
             _calendar_sync_status['fetching'] = fetching
             if fetching:
-                _calendar_sync_status['last_fetch_time'] = datetime.now().isoformat()
+                _calendar_sync_status['last_fetch_time'] = now
         if uploading is not None:
             _calendar_sync_status['uploading'] = uploading
             if uploading:
-                _calendar_sync_status['last_upload_time'] = datetime.now().isoformat()
+                _calendar_sync_status['last_upload_time'] = now
         if error is not None:
             _calendar_sync_status['last_error'] = error
             if error:
-                _calendar_sync_status['last_error_time'] = datetime.now().isoformat()
+                _calendar_sync_status['last_error_time'] = now
             else:
                 _calendar_sync_status['last_error'] = None
                 _calendar_sync_status['last_error_time'] = None
 
 def optimize_image_memory(img):
-    """Optimize image for memory usage"""
+    """Optimize image for memory usage
+    
+    Returns (img, resized) - resized tells the caller whether img now differs from the upload.
+    """
     if not ENABLE_MEMORY_OPTIMIZATION:
-        return img
+        return img, False
     
     # Check if image is very large and needs resizing
     max_dim = max(img.size)
     if max_dim > MAX_IMAGE_DIMENSION:
-        # Calculate new size maintaining aspect ratio
-        ratio = MAX_IMAGE_DIMENSION / max_dim
-        new_size = tuple(int(dim * ratio) for dim in img.size)
-        print(f"[{datetime.now()}] Resizing large image from {img.size} to {new_size} for memory optimization")
-        img = img.resize(new_size, Image.Resampling.LANCZOS)
+        logger.debug("Resizing large image from %s for memory optimization", img.size)
+        # thumbnail() keeps the aspect ratio and resizes in place; before decoding it
+        # asks JPEGs for a DCT-scaled draft and then reduce()s by an integer factor,
+        # so Lanczos only runs on the last <2x step
+        img.thumbnail((MAX_IMAGE_DIMENSION, MAX_IMAGE_DIMENSION), Image.Resampling.LANCZOS)
+        return img, True
     
-    return img
+    return img, False
 
 @app.route('/upload', methods=['POST'])
 def upload_image():
@@ -280,149 +445,109 @@ def upload_image():
     if file.filename == '':
         return jsonify({'error': 'No selected file'}), 400
     
+    if display_image is None:
+        logger.error("Cannot display upload, display driver unavailable: %s", _display_import_error)
+        return jsonify({'error': 'Display driver not available', 'details': _display_import_error}), 500
+    
+    # Get display options
+    rotation_mode = request.form.get('rotation_mode', 'landscape')  # landscape, portrait, or auto
+    auto_zoom = request.form.get('auto_zoom', 'true').lower() == 'true'
+    if rotation_mode not in display_image.ROTATION_MODES:
+        return jsonify({'error': f'Invalid rotation_mode. Must be one of: {", ".join(display_image.ROTATION_MODES)}'}), 400
+    
     # Check current mode and switch to image_receiver if in calendar_sync mode
-    config = load_config()
-    current_mode = config.get('mode', 'image_receiver')
+    current_mode = get_mode()
     mode_switched = False
     
-    log_info(f"[{datetime.now()}] Upload request received. Current mode: {current_mode}")
+    logger.info("Upload request received. Current mode: %s", current_mode)
     
     # Check if this upload is from the calendar sync service itself (should not trigger mode switch)
     is_sync_upload = request.headers.get('X-Calendar-Sync-Upload') == 'true'
     if is_sync_upload:
-        log_info(f"[{datetime.now()}] Calendar sync upload detected - skipping mode switch")
+        logger.info("Calendar sync upload detected - skipping mode switch")
     
     if current_mode == 'calendar_sync' and not is_sync_upload:
-        log_info(f"[{datetime.now()}] ===== MODE SWITCH: Upload detected while in calendar_sync mode ======")
-        log_info(f"[{datetime.now()}] Switching to image_receiver mode...")
+        logger.info("===== MODE SWITCH: Upload detected while in calendar_sync mode ======")
+        logger.info("Switching to image_receiver mode...")
         try:
-            # Switch to image_receiver mode using service manager
-            result = subprocess.run(
-                [sys.executable, SERVICE_MANAGER, 'set-mode', 'image_receiver'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            # Log the full output
-            if result.stdout:
-                log_info(f"[{datetime.now()}] set-mode stdout: {result.stdout}")
-            if result.stderr:
-                log_info(f"[{datetime.now()}] set-mode stderr: {result.stderr}")
-            
-            if result.returncode == 0:
-                # Verify the mode was actually changed
-                new_config = load_config()
-                new_mode = new_config.get('mode', 'unknown')
-                log_info(f"[{datetime.now()}] Mode changed from calendar_sync to {new_mode}")
-                
-                if new_mode == 'image_receiver':
-                    mode_switched = True
-                    log_info(f"[{datetime.now()}] ===== MODE SWITCH SUCCESSFUL ======")
-                    
-                    # Restart service to apply the mode change
-                    # Use longer timeout to allow for service restart
-                    log_info(f"[{datetime.now()}] Restarting service to apply mode change...")
-                    restart_result = subprocess.run(
-                        [sys.executable, SERVICE_MANAGER, 'restart'],
-                        capture_output=True,
-                        text=True,
-                        timeout=30
-                    )
-                    
-                    if restart_result.stdout:
-                        log_info(f"[{datetime.now()}] restart stdout: {restart_result.stdout}")
-                    if restart_result.stderr:
-                        log_info(f"[{datetime.now()}] restart stderr: {restart_result.stderr}")
-                    
-                    if restart_result.returncode == 0:
-                        log_info(f"[{datetime.now()}] ===== SERVICE RESTARTED IN IMAGE_RECEIVER MODE ======")
-                    else:
-                        log_info(f"[{datetime.now()}] Warning: Service restart returned non-zero exit code: {restart_result.returncode}")
-                else:
-                    log_info(f"[{datetime.now()}] ERROR: Mode verification failed. Expected 'image_receiver', got '{new_mode}'")
-            else:
-                log_info(f"[{datetime.now()}] ===== MODE SWITCH FAILED ======")
-                log_info(f"[{datetime.now()}] Exit code: {result.returncode}")
-                log_info(f"[{datetime.now()}] Error: {result.stderr}")
-        except subprocess.TimeoutExpired as e:
-            log_info(f"[{datetime.now()}] ===== MODE SWITCH TIMEOUT ======")
-            log_info(f"[{datetime.now()}] Error: Command timed out: {e}")
+            # Same in-process switch as /mode/switch; nothing needs restarting
+            mode_switched, _ = apply_mode('image_receiver')
+            logger.info("===== MODE SWITCH SUCCESSFUL ======")
         except Exception as e:
-            log_info(f"[{datetime.now()}] ===== MODE SWITCH EXCEPTION ======")
-            log_info(f"[{datetime.now()}] Error: {e}")
-            import traceback
-            traceback.print_exc(file=sys.stderr)
+            logger.error("===== MODE SWITCH EXCEPTION ======")
+            logger.exception("Error: %s", e)
     
-    # Get display options
-    rotation_mode = request.form.get('rotation_mode', 'landscape')  # landscape, portrait, or auto
-    auto_zoom = request.form.get('auto_zoom', 'true').lower() == 'true'
-    print(f"[{datetime.now()}] Display options - Rotation mode: {rotation_mode}, Auto-zoom: {auto_zoom}")
+    logger.debug("Display options - Rotation mode: %s, Auto-zoom: %s", rotation_mode, auto_zoom)
     
-    tmp_path = None
     img = None
     
     try:
-        # Save to a temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.png') as tmp:
-            file.save(tmp)
-            tmp_path = tmp.name
-        print(f"[{datetime.now()}] Received file saved to {tmp_path}")
-        
-        # Apply memory optimization if image is very large
+        # Pillow reads the upload straight from the file the multipart parser wrote
+        # (see UploadRequest). Opening it only parses the header, so the size guard
+        # below always runs, whether or not memory optimization is enabled.
         try:
-            img = Image.open(tmp_path)
-            print(f"[{datetime.now()}] Original image size: {img.size}")
-            
-            # Apply memory optimization
-            optimized_img = optimize_image_memory(img)
-            
-            # If image was optimized (resized), save it
-            if optimized_img.size != img.size:
-                print(f"[{datetime.now()}] Image size after optimization: {optimized_img.size}")
-                print(f"[{datetime.now()}] Saving optimized image...")
-                optimized_img.save(tmp_path, format='PNG', optimize=True, compress_level=COMPRESSION_QUALITY)
-                print(f"[{datetime.now()}] Image optimization completed and saved")
-            else:
-                print(f"[{datetime.now()}] No optimization needed")
-            
-            # Clean up image objects
-            img.close()
-            optimized_img.close()
+            img = Image.open(file.stream)
+        except Image.DecompressionBombError as e:
+            logger.warning("Rejecting upload: %s", e)
+            return jsonify({'error': f'Image too large (limit is {MAX_UPLOAD_PIXELS} pixels)'}), 413
+        except Exception as e:
+            # Leave unreadable uploads to display_image(), which reports the error
+            logger.warning("Could not read image header: %s", e)
             img = None
+        
+        if img is not None:
+            original_size = img.size
+            logger.debug("Original image size: %s", original_size)
             
-            # Force garbage collection
-            gc.collect()
+            # Refuse giant non-JPEG images before anything allocates their pixels;
+            # JPEGs are decoded at reduced scale instead (draft), both by
+            # optimize_image_memory() and by display_image()
+            if original_size[0] * original_size[1] > MAX_UPLOAD_PIXELS and img.format != 'JPEG':
+                logger.warning("Rejecting %s upload of %sx%s pixels", img.format, *original_size)
+                # Just drop it: close() would also close file.stream
+                img = None
+                return jsonify({'error': f'Image too large (limit is {MAX_UPLOAD_PIXELS} pixels)'}), 413
             
-        except Exception as e:
-            print(f"Error optimizing image: {e}")
-            if img:
-                img.close()
+            # Apply memory optimization if image is very large. A resized image is
+            # handed to the display as decoded pixels, so it is never re-encoded or
+            # written back to disk; otherwise the display reads the uploaded bytes as-is.
+            resized = False
+            try:
+                # Returns img unchanged when optimization is disabled
+                img, resized = optimize_image_memory(img)
+            except Exception as e:
+                logger.exception("Error optimizing image: %s", e)
+            
+            if resized:
+                # The EXIF block stays in img.info, so display_image() still
+                # applies the orientation tag
+                logger.debug("Image size after optimization: %s", img.size)
+            else:
+                logger.debug("No optimization applied")
+                # Just drop it: close() would also close file.stream
                 img = None
-            import traceback
-            traceback.print_exc()
-        
-        # Call the display_image.py script with display options
-        cmd = [sys.executable, IMAGE_SCRIPT, tmp_path]
-        cmd.extend(['--rotation-mode', rotation_mode])
-        if not auto_zoom:
-            cmd.append('--no-auto-zoom')
         
-        print(f"[{datetime.now()}] Running display command: {' '.join(cmd)}")
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            print(f"display_image.py failed: {result.stderr}")
-            if tmp_path and os.path.exists(tmp_path):
-                os.remove(tmp_path)
-            return jsonify({'error': 'display_image.py failed', 'details': result.stderr}), 500
-        print("display_image.py executed successfully.")
-        
-        # Clean up temporary file
-        if tmp_path and os.path.exists(tmp_path):
-            os.remove(tmp_path)
-        
-        # Final garbage collection
-        gc.collect()
+        # Not resized: display the upload straight from the file the multipart
+        # parser wrote (see UploadRequest); it is deleted when the request closes
+        if img is None:
+            file.stream.flush()
+            display_source = file.stream.name
+        else:
+            display_source = img
+        
+        # Display in-process (no interpreter startup per upload); the panel is a
+        # single device, so concurrent uploads take turns
+        logger.debug("Displaying %s (rotation mode: %s, auto-zoom: %s)", display_source, rotation_mode, auto_zoom)
+        with _display_lock:
+            success = display_image.display_image(
+                display_source,
+                rotation_mode=rotation_mode,
+                auto_zoom_after_rotation=auto_zoom
+            )
+        if not success:
+            logger.error("display_image failed")
+            return jsonify({'error': 'display_image failed', 'details': 'Check logs for details'}), 500
+        logger.info("display_image executed successfully.")
         
         response_data = {'status': 'success'}
         if mode_switched:
@@ -432,28 +557,31 @@ def upload_image():
         return jsonify(response_data), 200
         
     except Exception as e:
-        print(f"Error processing file: {e}")
-        # Clean up on error
-        if img:
-            img.close()
-        if tmp_path and os.path.exists(tmp_path):
-            os.remove(tmp_path)
-        gc.collect()
+        logger.error("Error processing file: %s", e)
         return jsonify({'error': str(e)}), 500
+    finally:
+        if img is not None:
+            img.close()
+
+# /config fields that are still accepted and reported but no longer do anything
+DEPRECATED_CONFIG_FIELDS = ['compression_quality']
 
 @app.route('/config', methods=['GET', 'POST'])
 def config():
-    global MAX_IMAGE_DIMENSION, COMPRESSION_QUALITY, ENABLE_MEMORY_OPTIMIZATION
+    global MAX_IMAGE_DIMENSION, COMPRESSION_QUALITY, ENABLE_MEMORY_OPTIMIZATION, _index_html
     
     if request.method == 'POST':
         try:
             data = request.get_json()
-            if 'max_image_dimension' in data:
-                MAX_IMAGE_DIMENSION = int(data['max_image_dimension'])
-            if 'compression_quality' in data:
-                COMPRESSION_QUALITY = int(data['compression_quality'])
-            if 'enable_memory_optimization' in data:
-                ENABLE_MEMORY_OPTIMIZATION = bool(data['enable_memory_optimization'])
+            # Parse every field before applying any, so a bad value can't leave the
+            # settings half-updated, and swap all three in one statement
+            max_dim = int(data.get('max_image_dimension', MAX_IMAGE_DIMENSION))
+            # 'compression_quality' is deprecated and has no effect (nothing is re-encoded);
+            # it is still validated and stored so existing clients keep working
+            compress_level = min(9, max(0, int(data.get('compression_quality', COMPRESSION_QUALITY))))
+            enable = bool(data.get('enable_memory_optimization', ENABLE_MEMORY_OPTIMIZATION))
+            MAX_IMAGE_DIMENSION, COMPRESSION_QUALITY, ENABLE_MEMORY_OPTIMIZATION = max_dim, compress_level, enable
+            _index_html = None
             
             return jsonify({
                 'status': 'success',
@@ -462,7 +590,8 @@ def config():
                     'max_image_dimension': MAX_IMAGE_DIMENSION,
                     'compression_quality': COMPRESSION_QUALITY,
                     'enable_memory_optimization': ENABLE_MEMORY_OPTIMIZATION
-                }
+                },
+                'deprecated': DEPRECATED_CONFIG_FIELDS
             })
         except Exception as e:
             return jsonify({'error': str(e)}), 400
@@ -471,29 +600,38 @@ def config():
     return jsonify({
         'max_image_dimension': MAX_IMAGE_DIMENSION,
         'compression_quality': COMPRESSION_QUALITY,
-        'enable_memory_optimization': ENABLE_MEMORY_OPTIMIZATION
+        'enable_memory_optimization': ENABLE_MEMORY_OPTIMIZATION,
+        'deprecated': DEPRECATED_CONFIG_FIELDS
     })
 
+_process = None  # psutil.Process for this server, created on the first /memory_status
+
 @app.route('/memory_status')
 def memory_status():
     """Get current memory usage information"""
+    global _process
+    if psutil is None:
+        return jsonify({'error': 'psutil not available'}), 500
     try:
-        import psutil
-        process = psutil.Process()
-        memory_info = process.memory_info()
+        if _process is None:
+            _process = psutil.Process()
+            # cpu_percent() reports usage since the previous call on the same
+            # object; the first call only sets the baseline
+            _process.cpu_percent()
+        # oneshot() lets both readings share the cached /proc lookups
+        with _process.oneshot():
+            memory_info = _process.memory_info()
+            cpu_percent = _process.cpu_percent()
         
         return jsonify({
             'memory_rss_mb': round(memory_info.rss / 1024 / 1024, 2),
             'memory_vms_mb': round(memory_info.vms / 1024 / 1024, 2),
-            'cpu_percent': process.cpu_percent(),
+            'cpu_percent': cpu_percent,
             'config': {
                 'max_image_dimension': MAX_IMAGE_DIMENSION,
-                'compression_quality': COMPRESSION_QUALITY,
                 'enable_memory_optimization': ENABLE_MEMORY_OPTIMIZATION
             }
         })
-    except ImportError:
-        return jsonify({'error': 'psutil not available'}), 500
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -502,9 +640,7 @@ def logs_viewer():
     """HTML page for viewing logs"""
     return render_template('logs.html')
 
-@app.route('/')
-def index():
-    return """
+INDEX_TEMPLATE = """
     <h1>ECAL Image Receiver Server</h1>
     <p>Server is running with memory optimizations!</p>
     <ul>
@@ -515,21 +651,49 @@ def index():
     <p><strong>Memory Optimization Settings:</strong></p>
     <ul>
         <li>Max Image Dimension: {max_dim}px</li>
-        <li>Compression Quality: {comp_qual}</li>
         <li>Memory Optimization: {mem_opt}</li>
     </ul>
-    """.format(
+    """
+
+_index_html = None  # (rendered index page, its ETag); reset by /config POST
+
+def _render_index():
+    html = INDEX_TEMPLATE.format(
         max_dim=MAX_IMAGE_DIMENSION,
-        comp_qual=COMPRESSION_QUALITY,
         mem_opt="Enabled" if ENABLE_MEMORY_OPTIMIZATION else "Disabled"
     )
+    return html, hashlib.sha1(html.encode()).hexdigest()
+
+@app.route('/')
+def index():
+    global _index_html
+    if _index_html is None:
+        _index_html = _render_index()
+    html, etag = _index_html
+    # Browsers revalidating an unchanged page get a bodyless 304
+    response = Response(html, mimetype='text/html')
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+# (rendered upload form, its ETag); upload.html has no per-request state or
+# settings, so it is rendered once per process
+_upload_form_html = None
 
 @app.route('/upload_form', methods=['GET'])
 def upload_form():
+    global _upload_form_html
     try:
-        return render_template('upload.html')
+        if _upload_form_html is None:
+            html = render_template('upload.html')
+            _upload_form_html = html, hashlib.sha1(html.encode()).hexdigest()
+        html, etag = _upload_form_html
+        # Cached for an hour, then revalidated with a bodyless 304 if unchanged
+        response = Response(html, mimetype='text/html',
+                            headers={'Cache-Control': 'public, max-age=3600'})
+        response.set_etag(etag)
+        return response.make_conditional(request)
     except Exception as e:
-        print(f"Error rendering template: {e}")
+        logger.error("Error rendering template: %s", e)
         return f"Template error: {e}", 500
 
 @app.route('/mode', methods=['GET', 'POST'])
@@ -557,12 +721,37 @@ def mode():
             return jsonify({'error': str(e)}), 400
     
     # GET request - return current mode
-    config = load_config()
     return jsonify({
-        'mode': config.get('mode', 'image_receiver'),
+        'mode': get_mode(),
         'available_modes': ['image_receiver', 'calendar_sync']
     })
 
+def apply_mode(new_mode):
+    """Persist new_mode and start or stop the calendar sync process to match
+    
+    Shared by /mode/switch and the automatic switch in /upload; the server
+    keeps running, so no service restart is involved. Returns (ok, message).
+    """
+    config = load_config()
+    config['mode'] = new_mode
+    save_config(config)
+    logger.info("Config updated to %s mode", new_mode)
+    
+    if new_mode == 'calendar_sync':
+        # Stop calendar sync if running (shouldn't be, but just in case)
+        stop_calendar_sync_process()
+        if not start_calendar_sync_process():
+            return False, 'Failed to start calendar sync process'
+        logger.info("Calendar sync process started - will fetch initial image shortly")
+        return True, f'Switched to {new_mode} mode. Calendar sync started.'
+    
+    # image_receiver mode: stop calendar sync process if running
+    if stop_calendar_sync_process():
+        logger.info("Calendar sync process stopped")
+        return True, f'Switched to {new_mode} mode. Calendar sync stopped.'
+    # Still succeeded even if stop failed (maybe it wasn't running)
+    return True, f'Switched to {new_mode} mode'
+
 @app.route('/mode/switch', methods=['POST'])
 def switch_mode():
     """Switch mode without restarting the main service"""
@@ -571,73 +760,41 @@ def switch_mode():
         new_mode = data.get('mode')
         
         # Get current mode for logging
-        config = load_config()
-        current_mode = config.get('mode', 'image_receiver')
+        current_mode = get_mode()
         
-        log_info(f"[{datetime.now()}] ===== MODE SWITCH REQUEST (NO RESTART) =====")
-        log_info(f"[{datetime.now()}] Current mode: {current_mode}")
-        log_info(f"[{datetime.now()}] Requested mode: {new_mode}")
+        logger.info("===== MODE SWITCH REQUEST (NO RESTART) =====")
+        logger.info("Current mode: %s", current_mode)
+        logger.info("Requested mode: %s", new_mode)
         
         if new_mode not in ['image_receiver', 'calendar_sync']:
-            log_info(f"[{datetime.now()}] ERROR: Invalid mode requested")
+            logger.error("Invalid mode requested")
             return jsonify({'error': 'Invalid mode. Must be image_receiver or calendar_sync'}), 400
         
         if current_mode == new_mode:
-            log_info(f"[{datetime.now()}] Already in {new_mode} mode, no switch needed")
+            logger.info("Already in %s mode, no switch needed", new_mode)
             return jsonify({
                 'status': 'success',
                 'message': f'Already in {new_mode} mode',
                 'mode': new_mode
             })
         
-        # Update config mode
-        config['mode'] = new_mode
-        save_config(config)
-        log_info(f"[{datetime.now()}] Config updated to {new_mode} mode")
-        
-        # Control calendar sync process based on mode
-        if new_mode == 'calendar_sync':
-            # Stop calendar sync if running (shouldn't be, but just in case)
-            stop_calendar_sync_process()
-            # Start calendar sync process
-            if start_calendar_sync_process():
-                log_info(f"[{datetime.now()}] ===== MODE SWITCH SUCCESSFUL: {current_mode} -> {new_mode} =====")
-                log_info(f"[{datetime.now()}] Calendar sync process started - will fetch initial image shortly")
-                return jsonify({
-                    'status': 'success',
-                    'message': f'Switched to {new_mode} mode. Calendar sync started.',
-                    'mode': new_mode
-                })
-            else:
-                log_info(f"[{datetime.now()}] ===== MODE SWITCH FAILED: Could not start calendar sync =====")
-                return jsonify({
-                    'error': 'Failed to start calendar sync process',
-                    'details': 'Check logs for details'
-                }), 500
-        else:  # image_receiver mode
-            # Stop calendar sync process if running
-            if stop_calendar_sync_process():
-                log_info(f"[{datetime.now()}] ===== MODE SWITCH SUCCESSFUL: {current_mode} -> {new_mode} =====")
-                log_info(f"[{datetime.now()}] Calendar sync process stopped")
-                return jsonify({
-                    'status': 'success',
-                    'message': f'Switched to {new_mode} mode. Calendar sync stopped.',
-                    'mode': new_mode
-                })
-            else:
-                # Still succeeded even if stop failed (maybe it wasn't running)
-                log_info(f"[{datetime.now()}] ===== MODE SWITCH SUCCESSFUL: {current_mode} -> {new_mode} =====")
-                return jsonify({
-                    'status': 'success',
-                    'message': f'Switched to {new_mode} mode',
-                    'mode': new_mode
-                })
+        ok, message = apply_mode(new_mode)
+        if not ok:
+            logger.error("===== MODE SWITCH FAILED: %s =====", message)
+            return jsonify({
+                'error': message,
+                'details': 'Check logs for details'
+            }), 500
+        logger.info("===== MODE SWITCH SUCCESSFUL: %s -> %s =====", current_mode, new_mode)
+        return jsonify({
+            'status': 'success',
+            'message': message,
+            'mode': new_mode
+        })
         
     except Exception as e:
-        log_info(f"[{datetime.now()}] ===== MODE SWITCH EXCEPTION ======")
-        log_info(f"[{datetime.now()}] Error: {e}")
-        import traceback
-        traceback.print_exc(file=sys.stderr)
+        logger.error("===== MODE SWITCH EXCEPTION ======")
+        logger.exception("Error: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/calendar_sync/status', methods=['GET', 'POST'])
@@ -647,23 +804,24 @@ def calendar_sync_status():
         # Calendar sync service updates its status here
         try:
             data = request.get_json()
+            now = datetime.now().isoformat()
             
             with _calendar_sync_lock:
                 if 'fetching' in data:
                     _calendar_sync_status['fetching'] = bool(data['fetching'])
                     if data['fetching']:
-                        _calendar_sync_status['last_fetch_time'] = datetime.now().isoformat()
+                        _calendar_sync_status['last_fetch_time'] = now
                 
                 if 'uploading' in data:
                     _calendar_sync_status['uploading'] = bool(data['uploading'])
                     if data['uploading']:
-                        _calendar_sync_status['last_upload_time'] = datetime.now().isoformat()
+                        _calendar_sync_status['last_upload_time'] = now
                 
                 if 'error' in data:
                     error = data['error']
                     _calendar_sync_status['last_error'] = error if error else None
                     if error:
-                        _calendar_sync_status['last_error_time'] = datetime.now().isoformat()
+                        _calendar_sync_status['last_error_time'] = now
                     else:
                         _calendar_sync_status['last_error_time'] = None
             
@@ -675,14 +833,10 @@ def calendar_sync_status():
     with _calendar_sync_lock:
         status = _calendar_sync_status.copy()
         
-        # Check if process is actually running
+        # _watch_calendar_sync_process() clears this as soon as the process exits
         if _calendar_sync_process:
-            if _calendar_sync_process.poll() is None:
-                status['active'] = True
-                status['process_pid'] = _calendar_sync_process.pid
-            else:
-                status['active'] = False
-                status['process_pid'] = None
+            status['active'] = True
+            status['process_pid'] = _calendar_sync_process.pid
         else:
             status['active'] = False
             status['process_pid'] = None
@@ -692,8 +846,6 @@ def calendar_sync_status():
 @app.route('/calendar_sync/trigger', methods=['POST', 'GET'])
 def trigger_calendar_sync():
     """Trigger a manual calendar sync"""
-    global _manual_sync_trigger
-    
     with _calendar_sync_lock:
         # Check if calendar sync is active
         if not _calendar_sync_process or _calendar_sync_process.poll() is not None:
@@ -703,8 +855,8 @@ def trigger_calendar_sync():
             }), 400
         
         # Set the trigger flag
-        _manual_sync_trigger = True
-        log_info(f"[{datetime.now()}] Manual calendar sync triggered")
+        _manual_sync_trigger.set()
+        logger.info("Manual calendar sync triggered")
         
         return jsonify({
             'status': 'success',
@@ -714,14 +866,16 @@ def trigger_calendar_sync():
 @app.route('/calendar_sync/check_trigger', methods=['GET'])
 def check_manual_sync_trigger():
     """Check if manual sync was triggered (used by calendar sync service)"""
-    global _manual_sync_trigger
+    # Polled every few seconds; the usual "not triggered" answer needs no lock
+    if not _manual_sync_trigger.is_set():
+        return jsonify({'trigger': False})
     
     with _calendar_sync_lock:
-        if _manual_sync_trigger:
-            _manual_sync_trigger = False  # Clear the flag after reading
+        # Test-and-clear under the lock so one trigger is only reported once
+        if _manual_sync_trigger.is_set():
+            _manual_sync_trigger.clear()  # Clear the flag after reading
             return jsonify({'trigger': True})
-        else:
-            return jsonify({'trigger': False})
+    return jsonify({'trigger': False})
 
 @app.route('/logs')
 def get_logs():
@@ -804,12 +958,12 @@ def mode_config():
 
 def cleanup_on_exit():
     """Cleanup function called on exit to ensure subprocesses are terminated"""
-    log_info(f"[{datetime.now()}] Cleanup on exit: stopping calendar sync process...")
+    logger.info("Cleanup on exit: stopping calendar sync process...")
     stop_calendar_sync_process()
 
 def signal_handler(signum, frame):
     """Handle termination signals to ensure clean shutdown"""
-    log_info(f"[{datetime.now()}] Received signal {signum}, cleaning up...")
+    logger.info("Received signal %s, cleaning up...", signum)
     cleanup_on_exit()
     sys.exit(0)
 
@@ -822,16 +976,26 @@ if __name__ == '__main__':
     # Check mode on startup and start calendar sync if needed
     config = load_config()
     current_mode = config.get('mode', 'image_receiver')
-    log_info(f"[{datetime.now()}] Starting image_receiver_server.py in {current_mode} mode...")
+    logger.info("Starting image_receiver_server.py in %s mode...", current_mode)
+    
+    # Single process, one thread per request: decode/resize work in Pillow releases
+    # the GIL so uploads overlap, and only the panel refresh is serialized by
+    # _display_lock. Multiple (gunicorn) workers would each own a copy of the
+    # calendar sync subprocess, the sync trigger flag and the log buffer.
+    # make_server() binds the listening socket before returning (app.run() would
+    # only return at shutdown), so the sync process can be started right after it.
+    server = make_server('0.0.0.0', 8000, app, threaded=True)
+    logger.info("Listening on http://0.0.0.0:8000")
     
     if current_mode == 'calendar_sync':
-        # Wait a moment for Flask to start, then start calendar sync process
-        def start_sync_delayed():
-            time.sleep(2)  # Give Flask time to start
-            log_info(f"[{datetime.now()}] Auto-starting calendar sync process (mode is calendar_sync)...")
-            start_calendar_sync_process()
-        
-        thread = threading.Thread(target=start_sync_delayed, daemon=True)
-        thread.start()
+        # In a thread: its endpoint check connects to this server, which only
+        # accepts once serve_forever() runs
+        logger.info("Auto-starting calendar sync process (mode is calendar_sync)...")
+        threading.Thread(target=start_calendar_sync_process, daemon=True).start()
+    
+    # Everything imported and built so far (Flask, Werkzeug, Jinja, Pillow) lives for
+    # the whole process; move it out of the cyclic GC's view so later collections
+    # only scan per-request garbage
+    gc.freeze()
     
-    app.run(host='0.0.0.0', port=8000, threaded=True, use_reloader=False)
+    server.serve_forever()
@@ -36,6 +36,9 @@ import io
 EPD_WIDTH       = 1200
 EPD_HEIGHT      = 1600
 
+# Byte translation table shifting a palette index into the high nibble
+_HIGH_NIBBLE = bytes((i << 4) & 0xFF for i in range(256))
+
 class EPD():
     def __init__(self):
         self.width = EPD_WIDTH
@@ -241,15 +244,16 @@ class EPD():
 
         # Convert the soruce image to the 7 colors, dithering if needed
         image_7color = image_temp.convert("RGB").quantize(palette=pal_image)
-        buf_7color = bytearray(image_7color.tobytes('raw'))
+        buf_7color = image_7color.tobytes('raw')
 
         # PIL does not support 4 bit color, so pack the 4 bits of color
-        # into a single byte to transfer to the panel
-        buf = [0x00] * int(self.width * self.height / 2)
-        idx = 0
-        for i in range(0, len(buf_7color), 2):
-            buf[idx] = (buf_7color[i] << 4) + buf_7color[i+1]
-            idx += 1
+        # into a single byte to transfer to the panel. Even pixels become the
+        # high nibble (via a translate table), odd pixels the low nibble.
+        # The nibbles never overlap, so both halves are merged as two wide
+        # integers with a single OR instead of one operation per byte.
+        high = buf_7color[0::2].translate(_HIGH_NIBBLE)
+        low = buf_7color[1::2]
+        buf = (int.from_bytes(high, 'big') | int.from_bytes(low, 'big')).to_bytes(len(high), 'big')
             
         return buf
     
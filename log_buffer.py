@@ -0,0 +1,57 @@
+"""
+In-memory log buffer shared by the ECAL web servers
+Backs the /logs and /logs/stream endpoints of calendar_server.py and image_receiver_server.py
+"""
+import queue
+import threading
+from datetime import datetime
+
+class LogBuffer:
+    """In-memory ring buffer for storing recent logs"""
+    def __init__(self, max_size=1000):
+        self.max_size = max_size
+        self.logs = []
+        self.lock = threading.Lock()
+        self.subscribers = []  # For SSE streaming
+    
+    def add_log(self, level, message, timestamp=None):
+        """Add a log entry"""
+        if timestamp is None:
+            timestamp = datetime.now().isoformat()
+        
+        log_entry = {
+            'timestamp': timestamp,
+            'level': level,
+            'message': message
+        }
+        
+        with self.lock:
+            self.logs.append(log_entry)
+            if len(self.logs) > self.max_size:
+                self.logs.pop(0)
+            
+            # Notify SSE subscribers
+            for subscriber_queue in self.subscribers[:]:  # Copy list to avoid modification during iteration
+                try:
+                    subscriber_queue.put(log_entry, block=False)
+                except queue.Full:
+                    # Remove subscriber if queue is full (client disconnected)
+                    self.subscribers.remove(subscriber_queue)
+    
+    def get_logs(self, limit=100):
+        """Get recent logs"""
+        with self.lock:
+            return self.logs[-limit:]
+    
+    def subscribe(self):
+        """Subscribe to new logs (returns a queue for SSE streaming)"""
+        subscriber_queue = queue.Queue(maxsize=100)
+        with self.lock:
+            self.subscribers.append(subscriber_queue)
+        return subscriber_queue
+    
+    def unsubscribe(self, subscriber_queue):
+        """Unsubscribe from log updates"""
+        with self.lock:
+            if subscriber_queue in self.subscribers:
+                self.subscribers.remove(subscriber_queue)
@@ -7,28 +7,71 @@ import json
 import os
 import sys
 import subprocess
+import tempfile
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 CONFIG_FILE = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'config.json')
 SERVICE_NAME = 'ecal-display'
 
+_config_cache = None  # ((st_mtime_ns, st_size), parsed config) of the last config.json read
+
 def load_config():
-    """Load configuration from JSON file"""
-    if not os.path.exists(CONFIG_FILE):
+    """Load configuration from JSON file
+    
+    The parsed file is cached and only re-read when its mtime or size changes.
+    """
+    global _config_cache
+    try:
+        st = os.stat(CONFIG_FILE)
+    except FileNotFoundError:
         print(f"Error: Config file not found at {CONFIG_FILE}")
         sys.exit(1)
-    
-    with open(CONFIG_FILE, 'r') as f:
-        return json.load(f)
+    key = (st.st_mtime_ns, st.st_size)
+    cache = _config_cache
+    if cache is None or cache[0] != key:
+        with open(CONFIG_FILE, 'rb') as f:
+            data = f.read()
+        cache = _config_cache = (key, orjson.loads(data) if orjson else json.loads(data))
+    return cache[1]
 
 def save_config(config):
     """Save configuration to JSON file"""
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=2)
+    global _config_cache
+    if orjson is not None:
+        data = orjson.dumps(config, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(config, indent=2).encode()
+    # Write a sibling temp file and rename it over config.json, so a crash, power
+    # loss or a concurrent reader (the running server) never sees a half-written file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(CONFIG_FILE), prefix='.config.', suffix='.json.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file 0600; keep config.json's existing permissions
+        try:
+            os.chmod(tmp_path, os.stat(CONFIG_FILE).st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, CONFIG_FILE)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    # We just wrote this exact dict, so cache it against the new file instead
+    # of re-reading it
+    st = os.stat(CONFIG_FILE)
+    _config_cache = ((st.st_mtime_ns, st.st_size), config)
     print(f"Configuration saved to {CONFIG_FILE}")
 
-def get_current_mode():
+def get_current_mode(config=None):
     """Get the current mode from config"""
-    config = load_config()
+    if config is None:
+        config = load_config()
     return config.get('mode', 'image_receiver')
 
 def set_mode(mode):
@@ -37,7 +80,8 @@ def set_mode(mode):
         print(f"Error: Invalid mode '{mode}'. Must be 'image_receiver' or 'calendar_sync'")
         sys.exit(1)
     
-    config = load_config()
+    # Copy so the cached dict is never left half-updated if the write fails
+    config = dict(load_config())
     config['mode'] = mode
     save_config(config)
     print(f"Mode set to: {mode}")
@@ -58,9 +102,9 @@ def run_systemctl(command):
         print(f"Error running systemctl: {e}")
         return False
 
-def start_service():
+def start_service(config=None):
     """Start the systemd service"""
-    mode = get_current_mode()
+    mode = get_current_mode(config)
     print(f"Starting service in '{mode}' mode...")
     return run_systemctl('start')
 
@@ -75,27 +119,32 @@ def restart_service():
     return run_systemctl('restart')
 
 def service_status():
-    """Get systemd service status"""
+    """Get systemd service state as (ActiveState, SubState)"""
+    # One read-only `systemctl show` query; unlike start/stop it needs no sudo
     try:
         result = subprocess.run(
-            ['sudo', 'systemctl', 'is-active', SERVICE_NAME],
+            ['systemctl', 'show', SERVICE_NAME, '--property=ActiveState,SubState'],
             capture_output=True,
             text=True
         )
-        return result.stdout.strip()
-    except:
-        return 'unknown'
+    except Exception:
+        return 'unknown', ''
+    props = dict(line.split('=', 1) for line in result.stdout.splitlines() if '=' in line)
+    return props.get('ActiveState', 'unknown'), props.get('SubState', '')
 
-def status():
+def status(config=None):
     """Show service status"""
-    config = load_config()
+    if config is None:
+        config = load_config()
     mode = config.get('mode', 'unknown')
     
     print(f"Current Mode: {mode}")
     
-    active_status = service_status()
+    active_status, sub_status = service_status()
     if active_status == 'active':
         print(f"Service Status: Running")
+    elif sub_status:
+        print(f"Service Status: {active_status} ({sub_status})")
     else:
         print(f"Service Status: {active_status}")
     
@@ -143,14 +192,17 @@ def main():
         parser.print_help()
         sys.exit(1)
     
+    # Commands that read the config get one parsed copy for the whole run
+    config = load_config() if args.command in ('start', 'status') else None
+    
     if args.command == 'start':
-        start_service()
+        start_service(config)
     elif args.command == 'stop':
         stop_service()
     elif args.command == 'restart':
         restart_service()
     elif args.command == 'status':
-        status()
+        status(config)
     elif args.command == 'set-mode':
         set_mode(args.mode)
     elif args.command == 'switch':
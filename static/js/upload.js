@@ -147,6 +147,60 @@ async function triggerManualSync() {
     }
 }
 
+// Largest side the server keeps (its max_image_dimension); null = upload as-is
+let maxImageDimension = null;
+
+async function loadUploadLimits() {
+    try {
+        const response = await fetch('/config');
+        const config = await response.json();
+        if (config.enable_memory_optimization) {
+            maxImageDimension = config.max_image_dimension;
+        }
+    } catch (error) {
+        console.error('Error loading upload limits:', error);
+    }
+}
+
+// The server shrinks anything larger than maxImageDimension anyway, so do it
+// before uploading: a phone photo becomes a fraction of the bytes on the wire.
+// EXIF orientation is applied while decoding, so the result is already upright.
+// Falls back to the original file whenever that wouldn't make it smaller.
+async function downscaleForUpload(file) {
+    if (!maxImageDimension || !window.createImageBitmap) return file;
+    
+    let bitmap;
+    try {
+        bitmap = await createImageBitmap(file, { imageOrientation: 'from-image' });
+    } catch (error) {
+        console.log('Not downscaling in browser:', error);
+        return file;
+    }
+    
+    const scale = maxImageDimension / Math.max(bitmap.width, bitmap.height);
+    if (scale >= 1) {
+        bitmap.close();
+        return file;
+    }
+    
+    const canvas = document.createElement('canvas');
+    canvas.width = Math.round(bitmap.width * scale);
+    canvas.height = Math.round(bitmap.height * scale);
+    const ctx = canvas.getContext('2d');
+    ctx.imageSmoothingQuality = 'high';
+    ctx.drawImage(bitmap, 0, 0, canvas.width, canvas.height);
+    bitmap.close();
+    
+    // PNGs stay PNG (they may have transparency); everything else becomes JPEG
+    const type = file.type === 'image/png' ? 'image/png' : 'image/jpeg';
+    const blob = await new Promise(resolve => canvas.toBlob(resolve, type, 0.9));
+    if (!blob || blob.size >= file.size) return file;
+    
+    console.log('Downscaled', file.name, 'to', canvas.width + 'x' + canvas.height, '-', file.size, '->', blob.size, 'bytes');
+    const name = type === 'image/png' ? file.name : file.name.replace(/\.[^.]*$/, '') + '.jpg';
+    return new File([blob], name, { type });
+}
+
 // Update mode UI
 function updateModeUI(mode) {
     const modeBadge = document.getElementById('currentMode');
@@ -237,6 +291,7 @@ document.addEventListener('DOMContentLoaded', function() {
     
     // Load current mode on page load
     loadCurrentMode();
+    loadUploadLimits();
     
     // Get all required elements
     const fileInput = document.getElementById('fileInput');
@@ -305,7 +360,6 @@ document.addEventListener('DOMContentLoaded', function() {
             console.log('Starting upload for file:', fileInput.files[0].name);
             
             const formData = new FormData();
-            formData.append('file', fileInput.files[0]);
             
             // Add display options
             const rotationMode = document.getElementById('rotationMode').value;
@@ -321,6 +375,8 @@ document.addEventListener('DOMContentLoaded', function() {
             uploadBtn.disabled = true;
             
             try {
+                formData.append('file', await downscaleForUpload(fileInput.files[0]));
+                
                 const response = await fetch('/upload', {
                     method: 'POST',
                     body: formData
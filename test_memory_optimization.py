@@ -8,10 +8,13 @@ import time
 
 SERVER_URL = "http://localhost:8000"
 
+# One keep-alive connection for all checks instead of a new one per request
+SESSION = requests.Session()
+
 def test_memory_status():
     """Test memory status endpoint"""
     try:
-        response = requests.get(f"{SERVER_URL}/memory_status")
+        response = SESSION.get(f"{SERVER_URL}/memory_status")
         if response.status_code == 200:
             data = response.json()
             print("✅ Memory Status:")
@@ -28,7 +31,7 @@ def test_config():
     """Test configuration endpoint"""
     try:
         # Get current config
-        response = requests.get(f"{SERVER_URL}/config")
+        response = SESSION.get(f"{SERVER_URL}/config")
         if response.status_code == 200:
             current_config = response.json()
             print("✅ Current Config:")
@@ -44,7 +47,7 @@ def test_config():
             'enable_memory_optimization': True
         }
         
-        response = requests.post(f"{SERVER_URL}/config", json=new_config)
+        response = SESSION.post(f"{SERVER_URL}/config", json=new_config)
         if response.status_code == 200:
             print("✅ Config updated successfully")
             updated_config = response.json()
@@ -58,7 +61,7 @@ def test_config():
 def test_upload_form():
     """Test upload form endpoint"""
     try:
-        response = requests.get(f"{SERVER_URL}/upload_form")
+        response = SESSION.get(f"{SERVER_URL}/upload_form")
         if response.status_code == 200:
             print("✅ Upload form accessible")
         else:
@@ -12,7 +12,7 @@ Tests verify that:
 import unittest
 import tempfile
 import os
-from PIL import Image
+from PIL import Image, ImageOps
 from unittest.mock import patch, MagicMock
 import sys
 
@@ -25,30 +25,38 @@ import display_image
 class TestRotationModes(unittest.TestCase):
     """Test rotation behavior for different modes"""
     
-    def setUp(self):
-        """Create test images"""
+    @classmethod
+    def setUpClass(cls):
+        """Create test images once; display_image() only reads them"""
         # Create a temporary directory for test images
-        self.test_dir = tempfile.mkdtemp()
+        cls.test_dir = tempfile.mkdtemp()
         
         # Create a portrait image (600x800)
-        self.portrait_image_path = os.path.join(self.test_dir, 'portrait.png')
+        cls.portrait_image_path = os.path.join(cls.test_dir, 'portrait.png')
         portrait_img = Image.new('RGB', (600, 800), color='red')
-        portrait_img.save(self.portrait_image_path)
+        portrait_img.save(cls.portrait_image_path)
         
         # Create a landscape image (800x600)
-        self.landscape_image_path = os.path.join(self.test_dir, 'landscape.png')
+        cls.landscape_image_path = os.path.join(cls.test_dir, 'landscape.png')
         landscape_img = Image.new('RGB', (800, 600), color='blue')
-        landscape_img.save(self.landscape_image_path)
+        landscape_img.save(cls.landscape_image_path)
         
         # Create a square image (800x800)
-        self.square_image_path = os.path.join(self.test_dir, 'square.png')
+        cls.square_image_path = os.path.join(cls.test_dir, 'square.png')
         square_img = Image.new('RGB', (800, 800), color='green')
-        square_img.save(self.square_image_path)
+        square_img.save(cls.square_image_path)
     
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         """Clean up test images"""
         import shutil
-        shutil.rmtree(self.test_dir)
+        shutil.rmtree(cls.test_dir)
+    
+    def setUp(self):
+        """Skip the 3 second hold after each (mocked) panel refresh"""
+        sleep_patcher = patch('display_image.time.sleep')
+        sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
     
     @patch('display_image.epd13in3E')
     def test_landscape_mode_no_rotation(self, mock_epd):
@@ -207,12 +215,117 @@ class TestRotationModes(unittest.TestCase):
             mock_rotate.assert_not_called()
             self.assertTrue(result)
 
+    
+    @patch('display_image.epd13in3E')
+    def test_in_memory_image_is_rotated_and_resized(self, mock_epd):
+        """Test that an already-decoded image (as /upload passes) is handled like a file"""
+        mock_epd.EPD_WIDTH = 960
+        mock_epd.EPD_HEIGHT = 680
+        mock_display = MagicMock()
+        mock_epd.EPD.return_value = mock_display
+        
+        portrait_img = Image.new('RGB', (600, 800), color='red')
+        
+        rotation_angles = []
+        original_rotate = Image.Image.rotate
+        
+        def track_rotate(self, angle, *args, **kwargs):
+            rotation_angles.append(angle)
+            return original_rotate(self, angle, *args, **kwargs)
+        
+        with patch.object(Image.Image, 'rotate', side_effect=track_rotate, autospec=True):
+            result = display_image.display_image(
+                portrait_img,
+                rotation_mode='auto',
+                auto_zoom_after_rotation=True
+            )
+        
+        self.assertTrue(result)
+        self.assertIn(270, rotation_angles, "Should rotate 270° for portrait->landscape")
+        
+        # The panel gets a full-frame RGB image
+        displayed = mock_display.getbuffer.call_args[0][0]
+        self.assertEqual(displayed.size, (960, 680))
+        self.assertEqual(displayed.mode, 'RGB')
+        
+        # The caller's image is left as it was and still usable (/upload closes it)
+        self.assertEqual(portrait_img.size, (600, 800))
+        self.assertEqual(portrait_img.mode, 'RGB')
+        self.assertEqual(portrait_img.getpixel((0, 0)), (255, 0, 0))
+
+    
+    def _save_jpeg_with_orientation(self, name, size, orientation):
+        """Save a JPEG whose EXIF orientation tag is set to the given value"""
+        path = os.path.join(self.test_dir, name)
+        exif = Image.Exif()
+        exif[display_image.ORIENTATION_TAG] = orientation
+        Image.new('RGB', size, color='blue').save(path, exif=exif)
+        return path
+    
+    @patch('display_image.epd13in3E')
+    def test_auto_mode_uses_exif_transposed_dimensions(self, mock_epd):
+        """Test that auto mode decides on the EXIF-corrected orientation"""
+        mock_epd.EPD_WIDTH = 960
+        mock_epd.EPD_HEIGHT = 680
+        mock_display = MagicMock()
+        mock_epd.EPD.return_value = mock_display
+        
+        # Stored landscape (800x600), but orientation 6 means it is shown as
+        # portrait (600x800) once transposed
+        image_path = self._save_jpeg_with_orientation('exif_6.jpg', (800, 600), 6)
+        
+        rotation_angles = []
+        original_rotate = Image.Image.rotate
+        
+        def track_rotate(self, angle, *args, **kwargs):
+            rotation_angles.append(angle)
+            return original_rotate(self, angle, *args, **kwargs)
+        
+        with patch('display_image.ImageOps.exif_transpose', wraps=ImageOps.exif_transpose) as mock_transpose, \
+                patch.object(Image.Image, 'rotate', side_effect=track_rotate, autospec=True):
+            result = display_image.display_image(
+                image_path,
+                rotation_mode='auto',
+                auto_zoom_after_rotation=False
+            )
+        
+        mock_transpose.assert_called_once()
+        # Portrait after transposing, so auto mode rotates it onto the landscape display
+        self.assertIn(270, rotation_angles, "Should rotate the transposed portrait image by 270°")
+        self.assertTrue(result)
+    
+    @patch('display_image.epd13in3E')
+    def test_exif_orientation_1_skips_transpose(self, mock_epd):
+        """Test that an upright EXIF orientation doesn't transpose the image"""
+        mock_epd.EPD_WIDTH = 960
+        mock_epd.EPD_HEIGHT = 680
+        mock_display = MagicMock()
+        mock_epd.EPD.return_value = mock_display
+        
+        image_path = self._save_jpeg_with_orientation('exif_1.jpg', (800, 600), 1)
+        
+        with patch('display_image.ImageOps.exif_transpose') as mock_transpose, \
+                patch.object(Image.Image, 'rotate', wraps=Image.Image.rotate) as mock_rotate:
+            result = display_image.display_image(
+                image_path,
+                rotation_mode='auto',
+                auto_zoom_after_rotation=False
+            )
+        
+        mock_transpose.assert_not_called()
+        # Still landscape, so auto mode leaves it as is
+        mock_rotate.assert_not_called()
+        self.assertTrue(result)
+
 
 class TestRotationEdgeCases(unittest.TestCase):
     """Test edge cases and error handling"""
     
     def setUp(self):
         self.test_dir = tempfile.mkdtemp()
+        sleep_patcher = patch('display_image.time.sleep')
+        sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
     
     def tearDown(self):
         import shutil
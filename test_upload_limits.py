@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for the upload size guard in image_receiver_server.
+
+Verifies that uploads whose header declares more than MAX_UPLOAD_PIXELS are
+rejected with 413 before being decoded or displayed, regardless of whether
+memory optimization is enabled.
+"""
+
+import unittest
+import atexit
+import io
+import struct
+import zlib
+from unittest.mock import patch, MagicMock
+import sys
+
+# Mock the epd13in3E module since it requires hardware
+sys.modules['epd13in3E'] = MagicMock()
+
+import image_receiver_server
+
+# No calendar sync process is ever started here; skip the server's exit hook,
+# which would log to a stream the test runner has already closed
+atexit.unregister(image_receiver_server.cleanup_on_exit)
+
+
+def _png_header(width, height):
+    """A PNG with only signature, IHDR and IEND: enough for Image.open() to read its size"""
+    def chunk(tag, data):
+        return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data))
+    ihdr = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)  # 8-bit RGB
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', ihdr) + chunk(b'IEND', b'')
+
+
+class TestUploadPixelLimit(unittest.TestCase):
+    """Test that oversized uploads are refused before decoding"""
+
+    def setUp(self):
+        self.client = image_receiver_server.app.test_client()
+        # Just over the limit, but below Pillow's own decompression bomb error
+        self.huge_png = _png_header(10000, image_receiver_server.MAX_UPLOAD_PIXELS // 10000 + 1)
+
+    def _post(self, data):
+        return self.client.post('/upload', data={
+            'file': (io.BytesIO(data), 'huge.png'),
+            'rotation_mode': 'landscape',
+        }, headers={'X-Calendar-Sync-Upload': 'true'})
+
+    def _assert_rejected(self, enable_memory_optimization):
+        with patch.object(image_receiver_server, 'ENABLE_MEMORY_OPTIMIZATION', enable_memory_optimization), \
+                patch.object(image_receiver_server.display_image, 'display_image') as mock_display:
+            response = self._post(self.huge_png)
+
+        self.assertEqual(response.status_code, 413)
+        self.assertIn('too large', response.get_json()['error'])
+        mock_display.assert_not_called()
+
+    def test_huge_png_rejected_with_optimization_enabled(self):
+        """Test that a huge PNG gets 413 when memory optimization is on"""
+        self._assert_rejected(True)
+
+    def test_huge_png_rejected_with_optimization_disabled(self):
+        """Test that turning off memory optimization doesn't turn off the size guard"""
+        self._assert_rejected(False)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
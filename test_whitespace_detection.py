@@ -17,8 +17,18 @@ import os
 import sys
 from PIL import Image
 
+_SELF_DIR = os.path.dirname(os.path.abspath(__file__))
+
 # Add parent directory to path to import calendar_server functions if needed
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _SELF_DIR)
+
+# Common screenshot locations, checked in order
+_SCREENSHOT_PATHS = (
+    'screenshot.png',
+    'calendar_screenshot.png',
+    '/tmp/calendar_screenshot.png',
+    os.path.join(_SELF_DIR, 'screenshot.png'),
+)
 
 
 class TestWhitespaceDetection(unittest.TestCase):
@@ -43,46 +53,41 @@ class TestWhitespaceDetection(unittest.TestCase):
         sample_step = max(1, actual_width // 50)
         rows_to_check = min(400, actual_height)
         
-        # Find the last row with significant content
+        # One bottom-up pass finds both the last row with significant content and
+        # the first run of consecutive white rows; each row is sampled only once
         last_content_row = None
-        for y in range(actual_height - 1, max(-1, actual_height - rows_to_check - 1), -1):
-            non_white_count = 0
-            sampled_pixels = 0
-            
-            for x in range(0, actual_width, sample_step):
-                r, g, b = pixels[x, y]
-                if not (r > self.white_threshold and g > self.white_threshold and b > self.white_threshold):
-                    non_white_count += 1
-                sampled_pixels += 1
-            
-            non_white_ratio = non_white_count / sampled_pixels if sampled_pixels > 0 else 0
-            
-            if non_white_ratio >= self.content_threshold:
-                last_content_row = y
-                break
-        
-        # Also check for consecutive white rows
         bottom_crop = actual_height
+        found_white_rows = False
         consecutive_white_rows = 0
         required_white_rows = 3
         
         for y in range(actual_height - 1, max(-1, actual_height - rows_to_check - 1), -1):
             white_pixel_count = 0
             sampled_pixels = 0
+            
             for x in range(0, actual_width, sample_step):
                 r, g, b = pixels[x, y]
                 if r > self.white_threshold and g > self.white_threshold and b > self.white_threshold:
                     white_pixel_count += 1
                 sampled_pixels += 1
             
-            white_ratio = white_pixel_count / sampled_pixels if sampled_pixels > 0 else 0
-            if white_ratio > 0.90:
-                consecutive_white_rows += 1
-                if consecutive_white_rows >= required_white_rows:
-                    bottom_crop = y + 1
-                    break
-            else:
-                consecutive_white_rows = 0
+            if last_content_row is None:
+                non_white_ratio = (sampled_pixels - white_pixel_count) / sampled_pixels if sampled_pixels > 0 else 0
+                if non_white_ratio >= self.content_threshold:
+                    last_content_row = y
+            
+            if not found_white_rows:
+                white_ratio = white_pixel_count / sampled_pixels if sampled_pixels > 0 else 0
+                if white_ratio > 0.90:
+                    consecutive_white_rows += 1
+                    if consecutive_white_rows >= required_white_rows:
+                        bottom_crop = y + 1
+                        found_white_rows = True
+                else:
+                    consecutive_white_rows = 0
+            
+            if last_content_row is not None and found_white_rows:
+                break
         
         # Use the more aggressive of the two methods
         if last_content_row is not None:
@@ -102,18 +107,7 @@ class TestWhitespaceDetection(unittest.TestCase):
     def test_whitespace_detection_on_screenshot(self):
         """Test whitespace detection on an actual screenshot"""
         # Look for screenshot in common locations
-        screenshot_paths = [
-            'screenshot.png',
-            'calendar_screenshot.png',
-            '/tmp/calendar_screenshot.png',
-            os.path.join(os.path.dirname(__file__), 'screenshot.png'),
-        ]
-        
-        screenshot_path = None
-        for path in screenshot_paths:
-            if os.path.exists(path):
-                screenshot_path = path
-                break
+        screenshot_path = next((path for path in _SCREENSHOT_PATHS if os.path.exists(path)), None)
         
         if screenshot_path is None:
             # If no screenshot found, skip the test but warn